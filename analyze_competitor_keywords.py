@@ -0,0 +1,70 @@
+import csv
+import glob
+import os
+from filter_keywords import clean_keyword
+from generate_campaign_keyword_import import read_keyword_export
+from util.competitor_util import load_competitor_dumps, score_overlap
+
+# Configuration
+COMPETITOR_FILES = ["input/竞品词列表.txt", "input/competitors/*.txt"]
+OUR_EXPORT_FILES = ["input/coin_us_exact.csv", "input/coin_us_broad.csv"]
+OUTPUT_DIR = "output"
+TOP_N = 500
+
+
+def analyze_competitor_keywords(competitor_files=None, export_files=None, output_dir=OUTPUT_DIR, top_n=TOP_N):
+    """
+    Compare competitor bid keywords against our active keywords and rank the gaps.
+    
+    Writes the per-app overlap, the ranked gap keywords with their scores, and
+    the top gap keywords as a comma separated list that can be passed to
+    filter_keywords.py as the keywords to be added.
+    
+    Args:
+        competitor_files: Competitor dump files or glob patterns
+        export_files: Our ASA keyword exports; only ACTIVE keywords are used
+        output_dir: Directory for the generated files
+        top_n: Number of gap keywords in the keyword list
+    """
+    patterns = competitor_files or COMPETITOR_FILES
+    paths = sorted({path for pattern in patterns for path in glob.glob(pattern)})
+    if not paths:
+        print("No competitor keyword dumps found")
+        return
+
+    our_keywords = set()
+    for export_file in export_files or OUR_EXPORT_FILES:
+        our_keywords.update(map(clean_keyword, read_keyword_export(export_file).keywords()))
+    print(f"Found {len(our_keywords)} active keywords of our own")
+
+    keyword_matrix = load_competitor_dumps(paths)
+    print(f"Vocabulary: {len(keyword_matrix.keywords)} keywords across {len(keyword_matrix.apps)} apps")
+
+    apps, gaps = score_overlap(keyword_matrix, our_keywords)
+
+    os.makedirs(output_dir, exist_ok=True)
+    overlap_file = os.path.join(output_dir, "competitor_app_overlap.csv")
+    gaps_file = os.path.join(output_dir, "competitor_gap_keywords.csv")
+    keywords_file = os.path.join(output_dir, "competitor_gap_keywords.txt")
+
+    with open(overlap_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['app', 'keywords', 'shared', 'similarity', 'jaccard'])
+        writer.writeheader()
+        writer.writerows(apps)
+
+    with open(gaps_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['keyword', 'score', 'competitor_apps', 'popularity'])
+        writer.writeheader()
+        writer.writerows(gaps)
+
+    # Same format as input/keywords_to_be_added.txt
+    with open(keywords_file, 'w', encoding='utf-8') as f:
+        f.write(','.join(gap['keyword'] for gap in gaps[:top_n]))
+
+    print(f"App overlap: {overlap_file}")
+    print(f"Gap keywords: {len(gaps)} -> {gaps_file}")
+    print(f"Top {min(top_n, len(gaps))} gap keywords for filter_keywords.py: {keywords_file}")
+
+
+if __name__ == "__main__":
+    analyze_competitor_keywords()
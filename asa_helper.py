@@ -0,0 +1,406 @@
+"""
+asa-helper: single entry point for the ASA keyword scripts.
+
+Usage:
+    python asa_helper.py fetch campaigns
+    python asa_helper.py fetch diandian "coin identifier" "coin value"
+    python asa_helper.py fetch diandian --mode http --workers 8 "coin identifier"
+    python asa_helper.py filter --csv input/ad_group_keyword_list.csv
+    python asa_helper.py translate --input input/coin_us_broad.csv --language PTB
+    python asa_helper.py generate --input export.csv --campaign-id 1 --ad-group-id 2
+    python asa_helper.py generate --source suggestions --input input/联想词列表.txt
+    python asa_helper.py negatives --input import.csv
+    python asa_helper.py convert output/file.csv
+    python asa_helper.py harvest --reports "input/search_terms_*.csv" --min-installs 3
+    python asa_helper.py harvest --campaign-id 1718142640 --ad-group-id 1718512514
+    python asa_helper.py competitors --dumps "input/competitors/*.txt" --exports input/coin_us_exact.csv
+    python asa_helper.py validate output --shard-dir output/shards --max-rows 1000
+    python asa_helper.py snapshots migrate --remove
+    python asa_helper.py snapshots reparse --keyword "coin identifier" --start 20250101 --end 20250131
+    python asa_helper.py daemon --socket /tmp/asa-helper.sock
+    python asa_helper.py submit --socket /tmp/asa-helper.sock convert output/file.csv
+    python asa_helper.py submit --socket /tmp/asa-helper.sock --report output/job.json convert output/file.csv
+    python asa_helper.py --report output/run.json --profile-dir output/profiles translate
+
+Options left out fall back to the defaults defined in each script. In
+daemon mode, API clients, their connection pools and the Chrome browser
+are created once and reused by every job.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+# The scripts import helpers as "util.*" from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+
+class WarmResources:
+    """Clients that are expensive to create, shared by all jobs of a process"""
+
+    def __init__(self):
+        self._apple_client = None
+        self._chrome_driver = None
+
+    @property
+    def apple_client(self):
+        if self._apple_client is None:
+            from fetch_apple_campaigns import create_client_from_env
+            self._apple_client = create_client_from_env()
+        return self._apple_client
+
+    @property
+    def chrome_driver(self):
+        if self._chrome_driver is None:
+            from util.diandian_util import create_chrome_driver
+            self._chrome_driver = create_chrome_driver()
+        return self._chrome_driver
+
+    def close(self) -> None:
+        if self._chrome_driver is not None:
+            self._chrome_driver.quit()
+            self._chrome_driver = None
+        if self._apple_client is not None:
+            self._apple_client.session.close()
+            self._apple_client = None
+
+
+def _options(args: argparse.Namespace, names: List[str]) -> Dict:
+    """Collect the options that were given, so scripts keep their own defaults"""
+    return {name: getattr(args, name) for name in names if getattr(args, name) is not None}
+
+
+def _write_reports(args: argparse.Namespace) -> None:
+    """Write the run report / Prometheus textfile requested on the command line"""
+    from util.metrics_util import write_report, write_prometheus_textfile
+    if args.report:
+        write_report(args.report)
+    if args.prometheus:
+        write_prometheus_textfile(args.prometheus)
+
+
+def cmd_fetch(args: argparse.Namespace, resources: WarmResources) -> None:
+    if args.source == 'campaigns':
+        from fetch_apple_campaigns import fetch_campaigns
+        fetch_campaigns(resources.apple_client, **_options(args, ['output_file']))
+        return
+
+    if not args.keywords:
+        raise ValueError("fetch diandian needs at least one keyword")
+
+    import json
+    from util.diandian_util import fetch_diandian_hot_words_batch
+
+    job_name = args.job_name or 'diandian_' + '_'.join(args.keywords)[:80]
+    results = fetch_diandian_hot_words_batch(
+        args.keywords,
+        job_name,
+        driver_factory=lambda: resources.chrome_driver,
+        mode=args.mode,
+        max_workers=args.workers
+    )
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output_file:
+        with open(args.output_file, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Saved {len(results)} results to {args.output_file}")
+    else:
+        print(output)
+
+
+def cmd_filter(args: argparse.Namespace, resources: WarmResources) -> None:
+    from filter_keywords import main as filter_main
+    filter_main(**_options(args, ['csv_file', 'txt_file', 'output_file']))
+
+
+def cmd_translate(args: argparse.Namespace, resources: WarmResources) -> None:
+    from translate_keyword_upload_file import generate_asa_import_file
+    generate_asa_import_file(**_options(args, [
+        'input_file', 'campaign_id', 'ad_group_id', 'match_type', 'bid', 'target_language', 'output_file'
+    ]))
+
+
+def cmd_generate(args: argparse.Namespace, resources: WarmResources) -> None:
+    if args.source == 'suggestions':
+        from generate_suggested_keyword_import import generate_keyword_import_file
+        generate_keyword_import_file(**_options(args, [
+            'input_file', 'campaign_id', 'ad_group_id', 'match_type', 'bid', 'output_file'
+        ]))
+        return
+
+    from generate_campaign_keyword_import import main as generate_main
+    options = _options(args, ['input_file', 'campaign_id', 'ad_group_id', 'campaign_name', 'match_type', 'output_file'])
+    if args.bid is not None:
+        options['default_bid'] = args.bid
+    generate_main(**options)
+
+
+def cmd_negatives(args: argparse.Namespace, resources: WarmResources) -> None:
+    from generate_negative_keyword_upload_file import generate_negative_keyword_file
+    generate_negative_keyword_file(**_options(args, [
+        'input_file', 'campaign_id', 'ad_group_id', 'match_type', 'output_file'
+    ]))
+
+
+def cmd_convert(args: argparse.Namespace, resources: WarmResources) -> None:
+    from util.csv_util import csv_to_xlsx
+    if not csv_to_xlsx(args.csv_path, args.xlsx_path):
+        print(f"Failed to convert {args.csv_path}")
+        sys.exit(1)
+
+
+def cmd_harvest(args: argparse.Namespace, resources: WarmResources) -> None:
+    from harvest_search_terms import harvest_search_terms
+    options = _options(args, [
+        'report_files', 'existing_keyword_files', 'output_dir', 'bid',
+        'min_installs', 'min_conversion_rate', 'negative_min_taps', 'negative_min_spend',
+        'campaign_id', 'ad_group_id'
+    ])
+    harvest_search_terms(**options)
+
+
+def cmd_competitors(args: argparse.Namespace, resources: WarmResources) -> None:
+    from analyze_competitor_keywords import analyze_competitor_keywords
+    analyze_competitor_keywords(**_options(args, ['competitor_files', 'export_files', 'output_dir', 'top_n']))
+
+
+def cmd_validate(args: argparse.Namespace, resources: WarmResources) -> None:
+    from validate_import_files import validate_import_files
+    options = _options(args, ['input_path', 'shard_dir', 'report_file', 'max_rows', 'max_workers'])
+    report = validate_import_files(shard=not args.no_shards, **options)
+    if report and report['errors']:
+        print(f"{report['errors']} problems found in import files, see the report")
+        sys.exit(1)
+
+
+def cmd_snapshots(args: argparse.Namespace, resources: WarmResources) -> None:
+    import json
+    from util.snapshot_archive import SnapshotArchive, migrate_legacy_snapshots
+
+    archive = SnapshotArchive(args.archive_dir)
+
+    if args.action == 'migrate':
+        report = migrate_legacy_snapshots(archive, args.source_dir, remove=args.remove)
+        if args.output_file:
+            with open(args.output_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return
+
+    if args.action == 'train':
+        if archive.train_from_archive() is None:
+            raise ValueError("No archived page snapshots to train on")
+        return
+
+    if args.action == 'list':
+        for entry in archive.find(args.keyword, args.start, args.end):
+            print(f"{entry['date']}  {entry['kind']:<4}  {entry['size']:>9}  {entry['stored']:>8}  {entry['keyword']}")
+        return
+
+    if args.action == 'show':
+        if not args.keyword or not args.start:
+            raise ValueError("snapshots show needs --keyword and --start")
+        content = archive.get(args.keyword, args.start, args.kind or 'html')
+        if content is None:
+            raise ValueError(f"No {args.kind or 'html'} snapshot for '{args.keyword}' on {args.start}")
+        output = content
+    else:
+        from util.diandian_util import reparse_snapshots
+        results = [
+            {'keyword': entry['keyword'], 'snapshot_date': entry['date'], 'result': result}
+            for entry, result in reparse_snapshots(archive, args.keyword, args.start, args.end)
+        ]
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+
+    if args.output_file:
+        with open(args.output_file, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"Saved to {args.output_file}")
+    else:
+        print(output)
+
+
+def _job_argv(argv: List[str]) -> List[str]:
+    """Drop the "--" separating submit's own options from the job"""
+    return argv[1:] if argv[:1] == ['--'] else argv
+
+
+def cmd_daemon(args: argparse.Namespace, resources: WarmResources) -> None:
+    from util.job_server import serve_job_directory, serve_socket
+    from util.metrics_util import DEFAULT_PROFILE_DIR, dump_profiles, enable_profiling, reset
+
+    daemon_profile_dir = args.profile_dir or DEFAULT_PROFILE_DIR
+
+    def handle(argv: List[str]) -> None:
+        job_args = build_parser().parse_args(_job_argv(argv))
+        if job_args.command in ('daemon', 'submit'):
+            raise ValueError(f"'{job_args.command}' cannot be run as a daemon job")
+        # Each job gets its own report and, if it asks for one, its own profile directory
+        reset()
+        enable_profiling(job_args.profile_dir or daemon_profile_dir)
+        try:
+            job_args.func(job_args, resources)
+        finally:
+            dump_profiles()
+            _write_reports(job_args)
+
+    try:
+        if args.socket:
+            serve_socket(handle, args.socket)
+        else:
+            serve_job_directory(handle, args.jobs_dir)
+    except KeyboardInterrupt:
+        print("\nDaemon stopped")
+
+
+def cmd_submit(args: argparse.Namespace, resources: WarmResources) -> None:
+    from util.job_server import submit_job
+
+    # Report options apply to the job, so they are passed on ahead of its subcommand
+    argv = []
+    for option, value in (('--report', args.job_report), ('--prometheus', args.job_prometheus),
+                          ('--profile-dir', args.job_profile_dir)):
+        if value:
+            argv += [option, value]
+    result = submit_job(args.socket, argv + _job_argv(args.job))
+    print(f"Job {result['status']} in {result['duration_s']}s")
+    if result['status'] != 'ok':
+        print(f"Error: {result.get('error')}")
+        sys.exit(1)
+
+
+def _add_campaign_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--input', dest='input_file', help='Input file')
+    parser.add_argument('--output', dest='output_file', help='Output file')
+    parser.add_argument('--campaign-id', type=int)
+    parser.add_argument('--ad-group-id', type=int)
+    parser.add_argument('--match-type', choices=['EXACT', 'BROAD'])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='asa-helper',
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--report', help='Write a JSON run report with per-stage timings and counters')
+    parser.add_argument('--prometheus', help='Write metrics to a Prometheus textfile collector file')
+    parser.add_argument('--profile-dir', help='Dump a cProfile file per stage into this directory')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch = subparsers.add_parser('fetch', help='Fetch ASA campaigns or diandian hot words')
+    fetch.add_argument('source', choices=['campaigns', 'diandian'])
+    fetch.add_argument('keywords', nargs='*', help='Seed keywords for diandian')
+    fetch.add_argument('--output', dest='output_file', help='Output JSON file')
+    fetch.add_argument('--job-name', help='Checkpoint name for a resumable diandian crawl')
+    fetch.add_argument('--mode', choices=['auto', 'http', 'browser'], default='auto',
+                       help='diandian: JSON endpoint with browser fallback, or only one of them')
+    fetch.add_argument('--workers', type=int, default=4, help='diandian: concurrent HTTP requests')
+    fetch.set_defaults(func=cmd_fetch)
+
+    filter_parser = subparsers.add_parser('filter', help='Drop keywords that already exist in an ad group')
+    filter_parser.add_argument('--csv', dest='csv_file', help='Existing ad group keyword export')
+    filter_parser.add_argument('--txt', dest='txt_file', help='Comma separated keywords to add')
+    filter_parser.add_argument('--output', dest='output_file', help='Output file')
+    filter_parser.set_defaults(func=cmd_filter)
+
+    translate = subparsers.add_parser('translate', help='Translate active keywords into an import file')
+    _add_campaign_options(translate)
+    translate.add_argument('--bid', type=float)
+    translate.add_argument('--language', dest='target_language')
+    translate.set_defaults(func=cmd_translate)
+
+    generate = subparsers.add_parser('generate', help='Generate a keyword import file')
+    _add_campaign_options(generate)
+    generate.add_argument('--source', choices=['export', 'suggestions'], default='export',
+                          help='Build from an ASA keyword export or a diandian suggestion dump')
+    generate.add_argument('--campaign-name')
+    generate.add_argument('--bid', type=float)
+    generate.set_defaults(func=cmd_generate)
+
+    negatives = subparsers.add_parser('negatives', help='Generate a negative keyword import file')
+    _add_campaign_options(negatives)
+    negatives.set_defaults(func=cmd_negatives)
+
+    convert = subparsers.add_parser('convert', help='Convert a CSV file to XLSX')
+    convert.add_argument('csv_path')
+    convert.add_argument('xlsx_path', nargs='?')
+    convert.set_defaults(func=cmd_convert)
+
+    harvest = subparsers.add_parser('harvest', help='Mine search term reports into exact and negative keywords')
+    harvest.add_argument('--reports', dest='report_files', help='Glob pattern of search term report CSVs')
+    harvest.add_argument('--existing', dest='existing_keyword_files', nargs='+',
+                         help='Keyword exports whose keywords are not promoted again')
+    harvest.add_argument('--output-dir')
+    harvest.add_argument('--bid', type=float, help='Bid for promoted exact keywords')
+    harvest.add_argument('--campaign-id', type=int, help='Campaign for promoted exact keywords')
+    harvest.add_argument('--ad-group-id', type=int, help='Ad group for promoted exact keywords')
+    harvest.add_argument('--min-installs', type=int)
+    harvest.add_argument('--min-conversion-rate', type=float)
+    harvest.add_argument('--negative-min-taps', type=int)
+    harvest.add_argument('--negative-min-spend', type=float)
+    harvest.set_defaults(func=cmd_harvest)
+
+    competitors = subparsers.add_parser('competitors', help='Rank competitor keywords we do not bid on yet')
+    competitors.add_argument('--dumps', dest='competitor_files', nargs='+', help='Competitor dump files or globs')
+    competitors.add_argument('--exports', dest='export_files', nargs='+', help='Our ASA keyword exports')
+    competitors.add_argument('--output-dir')
+    competitors.add_argument('--top-n', type=int, help='Number of gap keywords in the keyword list')
+    competitors.set_defaults(func=cmd_competitors)
+
+    validate = subparsers.add_parser('validate', help='Check import files against upload limits and shard them')
+    validate.add_argument('input_path', nargs='?', help='Import CSV file or directory of import files')
+    validate.add_argument('--shard-dir', help='Directory for the per-ad-group shards')
+    validate.add_argument('--error-report', dest='report_file', help='JSON error report path')
+    validate.add_argument('--max-rows', type=int, help='Maximum rows per shard')
+    validate.add_argument('--workers', dest='max_workers', type=int, help='Worker processes')
+    validate.add_argument('--no-shards', action='store_true', help='Only validate, do not write shards')
+    validate.set_defaults(func=cmd_validate)
+
+    snapshots = subparsers.add_parser('snapshots', help='Manage the compressed archive of raw diandian snapshots')
+    snapshots.add_argument('action', choices=['migrate', 'train', 'list', 'show', 'reparse'])
+    snapshots.add_argument('--archive-dir', default='output/snapshots', help='Archive directory')
+    snapshots.add_argument('--source-dir', default='output', help='migrate: directory of legacy snapshot files')
+    snapshots.add_argument('--remove', action='store_true', help='migrate: delete legacy files once archived')
+    snapshots.add_argument('--keyword', help='Only snapshots of this keyword')
+    snapshots.add_argument('--start', help='First snapshot date (YYYYMMDD); the date to show')
+    snapshots.add_argument('--end', help='Last snapshot date (YYYYMMDD)')
+    snapshots.add_argument('--kind', choices=['html', 'json'], help='show: snapshot kind, html by default')
+    snapshots.add_argument('--output', dest='output_file', help='Output file instead of stdout')
+    snapshots.set_defaults(func=cmd_snapshots)
+
+    daemon = subparsers.add_parser('daemon', help='Run jobs from a socket or job directory with warm clients')
+    source = daemon.add_mutually_exclusive_group()
+    source.add_argument('--socket', help='Unix socket path to accept jobs on')
+    source.add_argument('--jobs-dir', default='output/jobs', help='Directory to watch for *.json jobs')
+    daemon.set_defaults(func=cmd_daemon)
+
+    submit = subparsers.add_parser('submit', help='Send a job to a running daemon')
+    submit.add_argument('--socket', required=True, help='Unix socket path of the daemon')
+    submit.add_argument('--report', dest='job_report', help='Have the daemon write a JSON run report for the job')
+    submit.add_argument('--prometheus', dest='job_prometheus', help='Have the daemon write a Prometheus textfile')
+    submit.add_argument('--profile-dir', dest='job_profile_dir', help='Have the daemon profile the job into this directory')
+    submit.add_argument('job', nargs=argparse.REMAINDER, help='Subcommand and options to run')
+    submit.set_defaults(func=cmd_submit)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.profile_dir:
+        from util.metrics_util import enable_profiling
+        enable_profiling(args.profile_dir)
+
+    resources = WarmResources()
+    try:
+        args.func(args, resources)
+    finally:
+        resources.close()
+        if args.command != 'daemon':
+            from util.metrics_util import dump_profiles
+            dump_profiles()
+            _write_reports(args)
+
+
+if __name__ == "__main__":
+    main()
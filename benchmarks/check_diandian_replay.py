@@ -0,0 +1,133 @@
+"""
+Replay check for the browserless diandian fetch mode.
+
+Starts the fake endpoint server on the captured responses in
+benchmarks/fixtures/diandian, points DIANDIAN_API_URL at it and runs
+fetch_diandian_hot_words_batch(mode='http') end to end: pooled requests,
+JSON parsing through the JSON_FIELDS mapping, checkpointing and the
+snapshot archive. Exits non-zero when a result differs from EXPECTED.
+
+The fixtures cover the field name variants JSON_FIELDS accepts. Replace
+or extend them with real responses once captured; fetched responses are
+kept in output/snapshots and can be replayed with:
+
+    python src/util/diandian_fake_server.py output
+
+Usage:
+    python benchmarks/check_diandian_replay.py
+"""
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+FIXTURE_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures', 'diandian')
+
+# Parsed result expected for each fixture; None means the date falls back to today
+EXPECTED: Dict[str, Dict] = {
+    'coin identifier': {
+        'date': '2025-01-03',
+        'keywords': [
+            ('coin identifier', 6321, 1),
+            ('coin value checker', 5480, 2),
+            ('coin scanner', 5012, 3),
+            ('old coin value', 4620, 4),
+            ('penny identifier', 3998, 5),
+        ]
+    },
+    'coin value': {
+        'date': '2025-01-03',
+        'keywords': [
+            ('coin value app', 4703, 1),
+            ('coin value', 5876, 2),
+            ('rare coins worth money', 0, 3),
+        ]
+    },
+    'coin checker': {
+        'date': None,
+        'keywords': [
+            ('coin checker', 4410, 1),
+            ('coin checker free', 0, 2),
+            ('coin grade', 2950, 5),
+        ]
+    },
+}
+
+# Keyword without a fixture; the server answers 404 and it must not be recorded
+MISSING_KEYWORD = 'no such keyword'
+
+
+def check_results(results: Dict[str, Dict]) -> List[str]:
+    """Compare fetched results with EXPECTED and describe the differences"""
+    problems = []
+    if MISSING_KEYWORD in results:
+        problems.append(f"'{MISSING_KEYWORD}' has no fixture but was recorded")
+
+    for keyword, expected in EXPECTED.items():
+        result = results.get(keyword)
+        if not result:
+            problems.append(f"'{keyword}' was not fetched")
+            continue
+        if expected['date'] and result['date'] != expected['date']:
+            problems.append(f"'{keyword}' date {result['date']} != {expected['date']}")
+        actual = [(item['keyword'], item['search_volume'], item['rank']) for item in result['keywords']]
+        if actual != expected['keywords']:
+            problems.append(f"'{keyword}' keywords {actual} != {expected['keywords']}")
+    return problems
+
+
+def main() -> None:
+    from util import diandian_http
+    from util.diandian_fake_server import start_fake_server
+    from util.diandian_util import fetch_diandian_hot_words_batch
+    from util.snapshot_archive import get_archive
+
+    problems = []
+    original_cwd = os.getcwd()
+    server, url_template = start_fake_server(FIXTURE_DIR)
+
+    with tempfile.TemporaryDirectory(prefix='asa_replay_') as workdir:
+        # Checkpoints and the snapshot archive are written relative to the working directory
+        os.chdir(workdir)
+        try:
+            os.environ[diandian_http.API_URL_ENV] = url_template
+            keywords = list(EXPECTED) + [MISSING_KEYWORD]
+            results = fetch_diandian_hot_words_batch(keywords, 'replay_check', mode='http', max_workers=2)
+            problems += check_results(results)
+
+            archived = {entry['keyword'] for entry in get_archive().find(kind='json')}
+            if archived != set(EXPECTED):
+                problems.append(f"archived responses {sorted(archived)} != {sorted(EXPECTED)}")
+
+            # A later caller asking for more workers gets a larger pool
+            adapter = diandian_http.get_session(8).get_adapter(url_template)
+            if adapter._pool_maxsize < 8:
+                problems.append(f"pool size {adapter._pool_maxsize} after asking for 8 workers")
+
+            # Without an endpoint the HTTP phase is skipped entirely
+            del os.environ[diandian_http.API_URL_ENV]
+            http_batches = []
+            fetch_many_http = diandian_http.fetch_many_http
+            diandian_http.fetch_many_http = lambda *args, **kwargs: http_batches.append(args) or iter(())
+            try:
+                fetch_diandian_hot_words_batch(list(EXPECTED), 'replay_check_unset', mode='http')
+            finally:
+                diandian_http.fetch_many_http = fetch_many_http
+            if http_batches:
+                problems.append(f"{diandian_http.API_URL_ENV} unset but the HTTP phase still ran")
+        finally:
+            os.chdir(original_cwd)
+            server.shutdown()
+
+    if problems:
+        print("\nReplay check failed:")
+        print("\n".join(f"  - {problem}" for problem in problems))
+        sys.exit(1)
+    print("\nReplay check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Import-time benchmark for the util modules and entry points.
+
+Runs `python -X importtime` for each module in a fresh interpreter, reports
+the cumulative import time and fails when a module pulls in a heavy
+dependency it should only load lazily, or when its import time regressed
+past the tracked baseline.
+
+Import times are compared relative to the startup imports of a bare
+`python -c pass` measured in the same run, so a slower or busier machine
+scales both sides instead of looking like a regression. Timed runs use
+`python -S`, so .pth hooks of installed packages neither slow startup
+nor preload modules ours would otherwise import; a separate normal run
+detects the heavy imports.
+
+Usage:
+    python benchmarks/import_time.py            # check against baseline
+    python benchmarks/import_time.py --update   # record a new baseline
+
+Only re-record the baseline when a change to module imports is intended,
+in the commit that makes it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+BASELINE_FILE = os.path.join(ROOT_DIR, 'benchmarks', 'import_time_baseline.json')
+
+# Allowed slowdown over the baseline, relative to interpreter startup,
+# before a run is reported as a regression
+TOLERANCE = 1.5
+
+# Number of paired runs per module
+REPEAT = 7
+
+# Heavy packages that must not be loaded just by importing the module
+MODULES: Dict[str, List[str]] = {
+    'util.openai_util': ['openai', 'dotenv', 'httpx'],
+    'util.diandian_util': ['selenium', 'webdriver_manager', 'bs4', 'requests'],
+    'util.csv_util': ['pandas', 'openpyxl'],
+    'util.checkpoint_util': ['pandas', 'openai'],
+    'util.job_server': ['pandas', 'openai', 'requests'],
+    'util.metrics_util': ['pandas', 'openai', 'requests'],
+    'util.search_term_util': ['pandas', 'numpy'],
+    'util.competitor_util': ['numpy', 'scipy'],
+    'util.diandian_http': ['requests', 'dotenv'],
+    'util.snapshot_archive': ['zstandard', 'pandas', 'bs4'],
+    'util.import_validation': ['pandas', 'numpy'],
+    'asa_helper': ['pandas', 'openai', 'requests', 'selenium', 'bs4', 'dotenv'],
+}
+
+
+def measure_import(module: Optional[str], isolated: bool = True) -> Tuple[int, Set[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name, importable with src/ on the path, or
+            None to measure the startup imports of a bare interpreter
+        isolated: Skip the site module (-S), so site-packages are not
+            importable and their startup hooks do not run
+
+    Returns:
+        Tuple of cumulative import time in microseconds and the set of
+        top-level packages that were imported
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC_DIR, ROOT_DIR]))
+    result = subprocess.run(
+        [sys.executable, *(['-S'] if isolated else []), '-X', 'importtime',
+         '-c', f'import {module}' if module else 'pass'],
+        env=env,
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to import {module}:\n{result.stderr}")
+
+    total_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented name>"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.rstrip()
+        imported.add(name.strip().split('.')[0])
+        # Top-level entries are not indented beyond the single separator space
+        if module is None and not name.startswith('  '):
+            total_us += int(cumulative)
+        elif name == f' {module}':
+            total_us = int(cumulative)
+
+    return total_us, imported
+
+
+def run_benchmark() -> Tuple[int, Dict[str, Dict]]:
+    """
+    Measure interpreter startup and every tracked module.
+
+    Each module run is paired with a startup run right before it, and the
+    module is scored by the median module / startup ratio over its pairs,
+    so bursts of machine load hit both sides of a pair and single lucky or
+    unlucky runs do not count.
+
+    Returns:
+        Tuple of the fastest startup import time in microseconds and the
+        results per module
+    """
+    reference = []
+    results = {}
+    for module, forbidden in MODULES.items():
+        heavy_imports = sorted(measure_import(module, isolated=False)[1] & set(forbidden))
+        results[module] = {'import_time_us': None, 'relative': None, 'heavy_imports': heavy_imports}
+        if heavy_imports:
+            # Third-party packages cannot be imported without site-packages
+            continue
+
+        timings = []
+        ratios = []
+        for _ in range(REPEAT):
+            startup_us = measure_import(None)[0]
+            total_us = measure_import(module)[0]
+            reference.append(startup_us)
+            timings.append(total_us)
+            ratios.append(total_us / startup_us)
+
+        results[module]['import_time_us'] = min(timings)
+        results[module]['relative'] = round(statistics.median(ratios), 3)
+    return min(reference, default=0), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--update', action='store_true', help='Write the measured times as the new baseline')
+    args = parser.parse_args()
+
+    reference_us, results = run_benchmark()
+
+    baseline = {'reference_us': reference_us, 'modules': {}}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"{'interpreter startup':<28} {reference_us / 1000:8.1f} ms  (baseline {baseline['reference_us'] / 1000:.1f} ms)")
+
+    failures = []
+    for module, result in results.items():
+        if result['heavy_imports']:
+            failures.append(f"{module} eagerly imports: {', '.join(result['heavy_imports'])}")
+            print(f"{module:<28} not timed, imports {', '.join(result['heavy_imports'])}")
+            continue
+
+        line = f"{module:<28} {result['import_time_us'] / 1000:8.1f} ms  {result['relative']:6.2f}x startup"
+        previous = baseline['modules'].get(module)
+        if previous:
+            slowdown = result['relative'] / previous['relative']
+            line += f"  (baseline {previous['relative']:.2f}x, {slowdown:.2f}x slower)"
+            if slowdown > TOLERANCE:
+                failures.append(f"{module} import time regressed: {result['relative']:.2f}x startup, "
+                                f"baseline {previous['relative']:.2f}x")
+        print(line)
+
+    if args.update and any(result['heavy_imports'] for result in results.values()):
+        print("\n".join(failures))
+        print("Not updating the baseline while modules import heavy packages eagerly")
+        sys.exit(1)
+
+    if args.update:
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'reference_us': reference_us,
+                'modules': {
+                    module: {'import_time_us': r['import_time_us'], 'relative': r['relative']}
+                    for module, r in results.items()
+                }
+            }, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {BASELINE_FILE}")
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
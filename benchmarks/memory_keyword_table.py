@@ -0,0 +1,102 @@
+"""
+Memory benchmark: per-row dicts versus the interned KeywordTable.
+
+Loads a synthetic ASA export both ways and reports the memory held by
+the result, measured with tracemalloc:
+
+  - dict_rows: one 8-key dict per row, as the generators used to build
+  - keyword_table: KeywordTable with interned strings and typed arrays
+
+Usage:
+    python benchmarks/memory_keyword_table.py --scale 100k
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.synthetic_data import SCALES, generate_asa_export  # noqa: E402
+from util.keyword_table import KeywordTable  # noqa: E402
+
+
+def load_dict_rows(path: str) -> List[Dict]:
+    """Load the export as one dict per row, the previous representation"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return [
+            {
+                'Action': 'CREATE',
+                'Keyword ID': '',
+                'Keyword': row['Keyword'],
+                'Match Type': row['Match Type'],
+                'Status': row['Status'],
+                'Bid': float(row['Bid']),
+                'Campaign ID': int(row['Campaign ID']),
+                'Ad Group ID': int(row['Ad Group ID'])
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+def measure(loader: Callable[[str], object], path: str) -> Dict:
+    """
+    Measure the memory retained by a loader's result and its peak usage.
+
+    Args:
+        loader: Function loading the file
+        path: CSV path
+
+    Returns:
+        Dictionary with retained and peak bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = loader(path)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return {'retained_bytes': retained, 'peak_bytes': peak}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=list(SCALES), default='100k')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    args = parser.parse_args(argv)
+
+    count = SCALES[args.scale]
+    with tempfile.TemporaryDirectory(prefix='asa_mem_') as workdir:
+        path = os.path.join(workdir, 'export.csv')
+        generate_asa_export(path, count)
+
+        results = {
+            'scale': args.scale,
+            'rows': count,
+            'dict_rows': measure(load_dict_rows, path),
+            'keyword_table': measure(KeywordTable.read_export, path),
+        }
+
+    for name in ('dict_rows', 'keyword_table'):
+        stats = results[name]
+        print(f"{name:<14} retained {stats['retained_bytes'] / 1e6:8.1f} MB "
+              f"({stats['retained_bytes'] / count:6.1f} B/row)  peak {stats['peak_bytes'] / 1e6:8.1f} MB")
+    ratio = results['dict_rows']['retained_bytes'] / max(results['keyword_table']['retained_bytes'], 1)
+    print(f"KeywordTable uses {ratio:.1f}x less memory")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
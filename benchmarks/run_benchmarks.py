@@ -0,0 +1,291 @@
+"""
+Benchmark suite for the pipeline stages on synthetic data.
+
+Each case is timed over several rounds in the style of pytest-benchmark
+(min / mean / stddev / throughput) and the results are saved as JSON so
+they can be compared across versions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale 1k
+    python benchmarks/run_benchmarks.py --scale 100k --cases filter_keywords,generate_import_csv
+    python benchmarks/run_benchmarks.py --scale 1k --compare benchmarks/results/abc1234_1k.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.synthetic_data import (  # noqa: E402
+    SCALES, generate_asa_export, generate_diandian_html, generate_keyword_list, generate_search_term_report
+)
+
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+# Default number of timed rounds per scale
+DEFAULT_ROUNDS = {'1k': 5, '100k': 3, '1m': 1}
+
+# The translation path journals every keyword, so it is capped to keep runs short
+MAX_TRANSLATE_ROWS = 10_000
+
+# A case builder prepares its input in the work directory and returns the
+# function to time along with the number of rows it processes
+CaseBuilder = Callable[[str, int], Tuple[Callable[[], object], int]]
+
+
+def case_filter_keywords(workdir: str, count: int):
+    from filter_keywords import find_missing_keywords
+
+    export_path = os.path.join(workdir, 'existing.csv')
+    generate_asa_export(export_path, count)
+    with open(export_path, 'r', encoding='utf-8-sig') as f:
+        existing_content = f.read()
+    new_content = generate_keyword_list(count)
+
+    return lambda: find_missing_keywords(existing_content, new_content), count
+
+
+def case_read_keyword_export(workdir: str, count: int):
+    from generate_campaign_keyword_import import read_keyword_export
+
+    export_path = os.path.join(workdir, 'export.csv')
+    generate_asa_export(export_path, count)
+
+    return lambda: read_keyword_export(export_path), count
+
+
+def case_generate_import_csv(workdir: str, count: int):
+    from generate_campaign_keyword_import import read_keyword_export, generate_import_csv
+
+    export_path = os.path.join(workdir, 'export.csv')
+    generate_asa_export(export_path, count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        keywords = read_keyword_export(export_path)
+    output_path = os.path.join(workdir, 'output', 'import.csv')
+
+    def run():
+        generate_import_csv(keywords, output_path, 'Benchmark', 1, 2, 0.3, 'EXACT')
+
+    return run, len(keywords)
+
+
+def case_parse_diandian_table(workdir: str, count: int):
+    import bs4  # noqa: F401 - skip the case early when the parser is missing
+    from util.diandian_util import parse_diandian_table
+
+    html_content = generate_diandian_html(count)
+
+    return lambda: parse_diandian_table(html_content), count
+
+
+def case_csv_to_xlsx(workdir: str, count: int):
+    import pandas  # noqa: F401
+    import openpyxl  # noqa: F401
+    from util.csv_util import csv_to_xlsx
+
+    export_path = os.path.join(workdir, 'export.csv')
+    generate_asa_export(export_path, count)
+    xlsx_path = os.path.join(workdir, 'output', 'export.xlsx')
+
+    return lambda: csv_to_xlsx(export_path, xlsx_path), count
+
+
+def case_translate(workdir: str, count: int):
+    import translate_keyword_upload_file
+
+    rows = min(count, MAX_TRANSLATE_ROWS)
+    export_path = os.path.join(workdir, 'translate_input.csv')
+    generate_asa_export(export_path, rows, active_ratio=1.0)
+
+    # Stub the LLM so only our own overhead is measured
+    translate_keyword_upload_file.translate_text = lambda text, target_language: f"{text} {target_language.lower()}"
+    output_path = os.path.join(workdir, 'output', 'translated.csv')
+
+    def run():
+        translate_keyword_upload_file.generate_asa_import_file(
+            input_file=export_path, target_language='XX', output_file=output_path
+        )
+
+    return run, rows
+
+
+def case_harvest_search_terms(workdir: str, count: int):
+    import pandas  # noqa: F401
+    from util.search_term_util import aggregate_search_terms, classify_search_terms
+
+    report_path = os.path.join(workdir, 'search_terms.csv')
+    generate_search_term_report(report_path, count)
+
+    def run():
+        classify_search_terms(aggregate_search_terms([report_path]))
+
+    return run, count
+
+
+def case_validate_import_file(workdir: str, count: int):
+    import pandas  # noqa: F401
+    from util.import_validation import check_import_file
+    from util.keyword_table import KeywordTable
+
+    export_path = os.path.join(workdir, 'export.csv')
+    generate_asa_export(export_path, count)
+    import_path = os.path.join(workdir, 'import.csv')
+    KeywordTable.read_export(export_path).retarget(1, 2, 'EXACT', 0.3).write_csv(import_path, bid_format='{:.2f}')
+    shard_dir = os.path.join(workdir, 'shards')
+
+    return lambda: check_import_file(import_path, shard_dir), count
+
+
+CASES: Dict[str, CaseBuilder] = {
+    'filter_keywords': case_filter_keywords,
+    'read_keyword_export': case_read_keyword_export,
+    'generate_import_csv': case_generate_import_csv,
+    'parse_diandian_table': case_parse_diandian_table,
+    'csv_to_xlsx': case_csv_to_xlsx,
+    'translate_stubbed_llm': case_translate,
+    'harvest_search_terms': case_harvest_search_terms,
+    'validate_import_file': case_validate_import_file,
+}
+
+
+def benchmark(func: Callable[[], object], rounds: int) -> Dict:
+    """
+    Time a function over several rounds with its console output suppressed.
+
+    Args:
+        func: Function to time
+        rounds: Number of timed calls
+
+    Returns:
+        Dictionary with min, mean, max and stddev in seconds
+    """
+    timings = []
+    for _ in range(rounds):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        'rounds': rounds,
+        'min_s': round(min(timings), 6),
+        'mean_s': round(statistics.mean(timings), 6),
+        'max_s': round(max(timings), 6),
+        'stddev_s': round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+    }
+
+
+def get_version() -> str:
+    """Get the current git commit, or 'local' outside a git checkout"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def run_suite(scale: str, case_names: List[str], rounds: int) -> Dict:
+    """
+    Run the selected cases at one scale inside a temporary work directory.
+
+    Args:
+        scale: Key of SCALES
+        case_names: Names of the cases to run
+        rounds: Number of timed rounds per case
+
+    Returns:
+        Result document ready to be saved as JSON
+    """
+    count = SCALES[scale]
+    results = {}
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix='asa_bench_') as workdir:
+        # Scripts write checkpoints and output relative to the working directory
+        os.chdir(workdir)
+        try:
+            for name in case_names:
+                try:
+                    func, rows = CASES[name](workdir, count)
+                except ImportError as e:
+                    results[name] = {'skipped': f"missing dependency: {e.name}"}
+                    print(f"{name:<24} skipped ({e.name} not installed)")
+                    continue
+
+                stats = benchmark(func, rounds)
+                stats['rows'] = rows
+                stats['rows_per_s'] = round(rows / stats['mean_s']) if stats['mean_s'] else None
+                results[name] = stats
+                print(f"{name:<24} mean {stats['mean_s'] * 1000:10.2f} ms  "
+                      f"min {stats['min_s'] * 1000:10.2f} ms  {stats['rows_per_s']} rows/s")
+        finally:
+            os.chdir(original_cwd)
+
+    return {
+        'version': get_version(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline_path: str) -> None:
+    """Print the mean time of each case relative to a saved result file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline['version']} ({baseline['scale']}):")
+    if baseline['scale'] != current['scale']:
+        print(f"Warning: comparing scale {current['scale']} against {baseline['scale']}")
+    for name, stats in current['results'].items():
+        previous = baseline['results'].get(name, {})
+        if 'mean_s' not in stats or 'mean_s' not in previous:
+            continue
+        ratio = stats['mean_s'] / previous['mean_s'] if previous['mean_s'] else float('inf')
+        print(f"{name:<24} {ratio:6.2f}x  ({previous['mean_s'] * 1000:.2f} ms -> {stats['mean_s'] * 1000:.2f} ms)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', choices=list(SCALES), default='1k')
+    parser.add_argument('--cases', help=f"Comma separated subset of: {', '.join(CASES)}")
+    parser.add_argument('--rounds', type=int, help='Timed rounds per case (default depends on scale)')
+    parser.add_argument('--output', help='Result JSON path (default benchmarks/results/<version>_<scale>.json)')
+    parser.add_argument('--compare', help='Previous result JSON to compare against')
+    args = parser.parse_args(argv)
+
+    case_names = args.cases.split(',') if args.cases else list(CASES)
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    results = run_suite(args.scale, case_names, args.rounds or DEFAULT_ROUNDS[args.scale])
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['version']}_{args.scale}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Results saved to: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Synthetic data generators for benchmarking the pipeline stages.
+
+All generators are deterministic for a given seed so results are
+comparable across versions.
+"""
+import csv
+import random
+from datetime import date, timedelta
+from typing import List
+
+# Named scales used by the benchmark runner
+SCALES = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+EXPORT_COLUMNS = ['Action', 'Keyword ID', 'Keyword', 'Match Type', 'Status', 'Bid', 'Campaign ID', 'Ad Group ID']
+
+_WORDS = [
+    'coin', 'coins', 'value', 'identifier', 'scanner', 'scan', 'app', 'free', 'collector', 'collection',
+    'gold', 'silver', 'penny', 'dollar', 'quarter', 'dime', 'nickel', 'cent', 'rare', 'old',
+    'worth', 'price', 'guide', 'checker', 'finder', 'snap', 'identify', 'grading', 'ngc', 'pcgs',
+    'numismatic', 'error', 'mint', 'proof', 'bullion', 'ancient', 'roman', 'world', 'us', 'euro',
+    'plant', 'rock', 'crystal', 'mushroom', 'bird', 'insect', 'tree', 'flower', 'stone', 'gem',
+    'valor', 'monedas', 'moeda', 'identificador', 'escaner', 'antiguas', 'colección', 'precio', 'de', 'para',
+]
+
+
+def generate_keywords(count: int, seed: int = 0) -> List[str]:
+    """
+    Generate realistic looking search keywords of one to four words.
+
+    Duplicates are possible, as they are in real keyword lists.
+
+    Args:
+        count: Number of keywords to generate
+        seed: Random seed
+
+    Returns:
+        List of keywords
+    """
+    rng = random.Random(seed)
+    return [' '.join(rng.choices(_WORDS, k=rng.randint(1, 4))) for _ in range(count)]
+
+
+def generate_asa_export(path: str, count: int, seed: int = 0, active_ratio: float = 0.8) -> None:
+    """
+    Write an ASA bulk keyword export with the exact 8-column schema and a UTF-8 BOM.
+
+    Args:
+        path: Output CSV path
+        count: Number of keyword rows
+        seed: Random seed
+        active_ratio: Share of rows with ACTIVE status, the rest are PAUSED
+    """
+    rng = random.Random(seed)
+    keywords = generate_keywords(count, seed)
+    campaign_id = 1120711183
+    ad_group_ids = [1122199292 + i for i in range(max(1, count // 5000))]
+
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for idx, keyword in enumerate(keywords):
+            writer.writerow([
+                'N/A',
+                1700000000 + idx,
+                keyword,
+                rng.choice(['EXACT', 'BROAD']),
+                'ACTIVE' if rng.random() < active_ratio else 'PAUSED',
+                f"{rng.choice([0.2, 0.3, 0.6, 0.65, 1.5, 2.2])}",
+                campaign_id,
+                rng.choice(ad_group_ids)
+            ])
+
+
+def generate_search_term_report(path: str, count: int, seed: int = 0) -> None:
+    """
+    Write an ASA search term report for BROAD ad groups.
+
+    Terms repeat across rows (one row per day / keyword) with varied
+    casing and spacing so aggregation by normalized term has work to do.
+
+    Args:
+        path: Output CSV path
+        count: Number of report rows
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    terms = generate_keywords(max(1, count // 10), seed + 3)
+
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', 'Search Term', 'Keyword', 'Match Type', 'Impressions', 'Taps', 'Installs',
+                         'Spend', 'Campaign ID', 'Ad Group ID'])
+        for _ in range(count):
+            term = rng.choice(terms)
+            if rng.random() < 0.1:
+                term = '  ' + term.upper() + ' '
+            impressions = rng.randint(0, 200)
+            taps = rng.randint(0, impressions // 10)
+            installs = rng.randint(0, taps) if rng.random() < 0.3 else 0
+            writer.writerow([
+                '2024-11-27', term, term.split(' ')[-1], 'BROAD', impressions, taps, installs,
+                f"{taps * rng.uniform(0.2, 1.5):.2f}", 1718142639, 1718512513
+            ])
+
+
+def generate_keyword_list(count: int, seed: int = 0) -> str:
+    """
+    Build the content of a comma separated keyword list like input/keywords_to_be_added.txt.
+
+    Args:
+        count: Number of keywords
+        seed: Random seed
+
+    Returns:
+        File content
+    """
+    return ','.join(generate_keywords(count, seed + 1))
+
+
+def generate_diandian_html(count: int, seed: int = 0, days: int = 7) -> str:
+    """
+    Build a diandian.com hot word page containing a dd-data-table.
+
+    The markup mirrors what parse_diandian_table() reads: ranking images for
+    the top three rows, rank-value spans below that, and one cell per date
+    with the keyword name and search volume.
+
+    Args:
+        count: Number of ranked keyword rows
+        seed: Random seed
+        days: Number of date columns
+
+    Returns:
+        HTML page content
+    """
+    rng = random.Random(seed)
+    keywords = generate_keywords(count * days, seed + 2)
+    start = date(2024, 11, 21)
+    dates = [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+    rank_images = {1: 'first', 2: 'second', 3: 'third'}
+
+    parts = [
+        '<html><head><title>点点数据</title></head><body><div class="app-shell">',
+        '<table class="dd-data-table"><thead><tr><th>#</th>',
+        ''.join(f'<th>{d}</th>' for d in dates),
+        '</tr></thead><tbody>',
+    ]
+    for rank in range(1, count + 1):
+        if rank in rank_images:
+            rank_html = f'<img class="ranking-img" src="/static/rank-{rank_images[rank]}.png">'
+        else:
+            rank_html = f'<span class="rank-value">{rank}</span>'
+        parts.append(f'<tr><td>{rank_html}</td>')
+        for day in range(days):
+            keyword = keywords[(rank - 1) * days + day]
+            parts.append(
+                '<td><div class="table-content">'
+                f'<div class="table-content-name">{keyword}</div>'
+                f'<div class="dd-second-font-color">{rng.randint(4605, 9000)}</div>'
+                '</div></td>'
+            )
+        parts.append('</tr>')
+    parts.append('</tbody></table></div></body></html>')
+    return ''.join(parts)
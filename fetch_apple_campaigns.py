@@ -3,10 +3,7 @@ from typing import Dict, List, Optional
 import os
 from datetime import datetime
 import json
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from util.metrics_util import timed, increment
 
 class AppleSearchAdsAPI:
     BASE_URL = "https://api.searchads.apple.com/api/v4"
@@ -25,6 +22,27 @@ class AppleSearchAdsAPI:
         self.org_id = org_id
         self.access_token = None
         self.token_expiry = None
+        # Reuse connections across requests
+        self.session = requests.Session()
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session and record its metrics
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Extra arguments passed to requests
+            
+        Returns:
+            Response object, raising for error status codes
+        """
+        increment('api_calls.apple_search_ads')
+        with timed('apple_search_ads_request'):
+            response = self.session.request(method, url, **kwargs)
+        increment('bytes_read.apple_search_ads', len(response.content))
+        response.raise_for_status()
+        return response
     
     def _get_auth_token(self) -> None:
         """Authenticate and get access token"""
@@ -41,8 +59,7 @@ class AppleSearchAdsAPI:
             "scope": "searchads.readonly"
         }
         
-        response = requests.post(auth_url, headers=headers, data=data)
-        response.raise_for_status()
+        response = self._request("POST", auth_url, headers=headers, data=data)
         
         token_data = response.json()
         self.access_token = token_data["access_token"]
@@ -78,12 +95,12 @@ class AppleSearchAdsAPI:
             "offset": offset
         }
         
-        response = requests.get(
+        response = self._request(
+            "GET",
             url,
             headers=self._get_headers(),
             params=params
         )
-        response.raise_for_status()
         
         return response.json()["data"]
     
@@ -99,15 +116,25 @@ class AppleSearchAdsAPI:
         """
         url = f"{self.BASE_URL}/campaigns/{campaign_id}"
         
-        response = requests.get(
+        response = self._request(
+            "GET",
             url,
             headers=self._get_headers()
         )
-        response.raise_for_status()
         
         return response.json()["data"]
 
-def main():
+def create_client_from_env() -> AppleSearchAdsAPI:
+    """
+    Create an API client from the credentials in the environment / .env file
+    
+    Returns:
+        Configured AppleSearchAdsAPI instance
+    """
+    # Load environment variables from .env file
+    from dotenv import load_dotenv
+    load_dotenv()
+
     # Load credentials from environment variables
     client_id = os.getenv("APPLE_ADS_CLIENT_ID")
     client_secret = os.getenv("APPLE_ADS_CLIENT_SECRET")
@@ -116,15 +143,21 @@ def main():
     if not all([client_id, client_secret, org_id]):
         raise ValueError("Missing required environment variables for Apple Search Ads API")
     
-    # Initialize API client
-    api_client = AppleSearchAdsAPI(client_id, client_secret, org_id)
+    return AppleSearchAdsAPI(client_id, client_secret, org_id)
+
+def fetch_campaigns(api_client: AppleSearchAdsAPI, output_file: str = "apple_campaigns.json") -> None:
+    """
+    Fetch all campaigns and save them to a JSON file
     
+    Args:
+        api_client: Authenticated (or lazily authenticating) API client
+        output_file: Path of the JSON file to write
+    """
     try:
         # Fetch all campaigns
         campaigns = api_client.get_campaigns()
         
         # Save campaigns to JSON file
-        output_file = "apple_campaigns.json"
         with open(output_file, "w") as f:
             json.dump(campaigns, f, indent=2)
             
@@ -140,5 +173,10 @@ def main():
     except requests.exceptions.RequestException as e:
         print(f"Error fetching campaigns: {str(e)}")
 
+def main():
+    # Initialize API client
+    api_client = create_client_from_env()
+    fetch_campaigns(api_client)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
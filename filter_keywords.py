@@ -85,14 +85,13 @@ def find_missing_keywords(existing_content, new_content):
 	return sorted(missing_keywords)  # Sort alphabetically for consistent output
 
 
-def main():
-	# Define input and output directories and file paths
-	input_dir = "input"
-	output_dir = "output"
-	csv_file = os.path.join(input_dir, "ad_group_keyword_list.csv")
-	txt_file = os.path.join(input_dir, "keywords_to_be_added.txt")
-	output_file = os.path.join(output_dir, "keywords_to_be_added_clean.txt")
+# Define input and output file paths
+CSV_FILE = os.path.join("input", "ad_group_keyword_list.csv")
+TXT_FILE = os.path.join("input", "keywords_to_be_added.txt")
+OUTPUT_FILE = os.path.join("output", "keywords_to_be_added_clean.txt")
 
+
+def main(csv_file=CSV_FILE, txt_file=TXT_FILE, output_file=OUTPUT_FILE):
 	# Read files
 	csv_content = read_file(csv_file)
 	txt_content = read_file(txt_file)
@@ -1,32 +1,27 @@
-import csv
 import os
-from typing import List, Dict
+from typing import Optional
+from util.keyword_table import KeywordTable
+from util.metrics_util import timed, increment
 
-def read_keyword_export(filepath: str) -> List[Dict]:
+@timed('read_keyword_export')
+def read_keyword_export(filepath: str) -> KeywordTable:
     """
     Read and parse the keyword export CSV file.
     Only returns active keywords with their relevant details.
     """
-    keywords = []
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                # Check if keyword status is "ACTIVE" - note the exact column names
-                if row.get('Status', '') == 'ACTIVE':
-                    keywords.append({
-                        'keyword': row['Keyword'],
-                        'match_type': row['Match Type'],  # Changed from 'Match type'
-                        'ad_group': row['Ad Group ID']    # Changed from 'Ad group'
-                    })
+        keywords = KeywordTable.read_export(filepath, status='ACTIVE')
     except Exception as e:
         print(f"Error reading file {filepath}: {str(e)}")
-        return []
+        return KeywordTable()
     
+    increment('bytes_read.read_keyword_export', os.path.getsize(filepath))
+    increment('rows_processed.read_keyword_export', len(keywords))
     print(f"Found {len(keywords)} active keywords")
     return keywords
 
-def generate_import_csv(keywords: List[Dict], output_path: str, campaign_name: str, 
+@timed('generate_import_csv')
+def generate_import_csv(keywords: KeywordTable, output_path: str, campaign_name: str, 
                        campaign_id: int, ad_group_id: int, default_bid: float, match_type: str) -> bool:
     """
     Generate a CSV file for importing keywords to a new campaign.
@@ -35,28 +30,17 @@ def generate_import_csv(keywords: List[Dict], output_path: str, campaign_name: s
     Action,Keyword ID,Keyword,Match Type,Status,Bid,Campaign ID,Ad Group ID
     """
     try:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8', newline='') as file:
-            writer = csv.writer(file)
-            
-            # Write header matching exact CSV format
-            writer.writerow(['Action', 'Keyword ID', 'Keyword', 'Match Type', 'Status', 
-                           'Bid', 'Campaign ID', 'Ad Group ID'])
-            
-            # Write keyword data
-            for kw in keywords:
-                writer.writerow([
-                    'CREATE',           # Action
-                    '',                 # Keyword ID (empty for new keywords)
-                    kw['keyword'],      # Keyword
-                    match_type,   # Match Type
-                    'ACTIVE',           # Status
-                    f"{default_bid:.2f}", # Bid
-                    campaign_id,        # Campaign ID
-                    ad_group_id         # Ad Group ID
-                ])
+        # New keywords: empty Keyword ID, ACTIVE status, same keyword text
+        new_keywords = keywords.retarget(
+            campaign_id=campaign_id,
+            ad_group_id=ad_group_id,
+            match_type=match_type,
+            bid=default_bid
+        )
+        new_keywords.write_csv(output_path, bid_format='{:.2f}')
         
+        increment('rows_processed.generate_import_csv', len(keywords))
+        increment('bytes_written.generate_import_csv', os.path.getsize(output_path))
         print(f"Successfully generated import file at {output_path}")
         print(f"Total keywords written: {len(keywords)}")
         return True
@@ -65,22 +49,26 @@ def generate_import_csv(keywords: List[Dict], output_path: str, campaign_name: s
         print(f"Error generating import file: {str(e)}")
         return False
 
-def main():
-    # Configuration
-    INPUT_FILE = "output/campaign_1726069162_adgroup_1726011485_keyword_import.csv"
-    
-    # Define campaign and ad group IDs
-    NEW_CAMPAIGN_ID = 1726069162
-    NEW_AD_GROUP_ID = 1725976928
-    
+# Configuration
+INPUT_FILE = "output/campaign_1726069162_adgroup_1726011485_keyword_import.csv"
+
+# Define campaign and ad group IDs
+NEW_CAMPAIGN_ID = 1726069162
+NEW_AD_GROUP_ID = 1725976928
+
+NEW_CAMPAIGN_NAME = "New Campaign"  # Change this to your desired campaign name
+DEFAULT_BID = 0.30  # Change this to your desired default bid
+MATCH_TYPE = 'BROAD'
+
+def main(input_file: str = INPUT_FILE, campaign_id: int = NEW_CAMPAIGN_ID, ad_group_id: int = NEW_AD_GROUP_ID,
+         campaign_name: str = NEW_CAMPAIGN_NAME, default_bid: float = DEFAULT_BID, match_type: str = MATCH_TYPE,
+         output_file: Optional[str] = None):
     # Generate output filename with campaign and ad group IDs
-    OUTPUT_FILE = f"output/campaign_{NEW_CAMPAIGN_ID}_adgroup_{NEW_AD_GROUP_ID}_keyword_import.csv"
-    NEW_CAMPAIGN_NAME = "New Campaign"  # Change this to your desired campaign name
-    DEFAULT_BID = 0.30  # Change this to your desired default bid
-    MATCH_TYPE = 'BROAD'
+    if not output_file:
+        output_file = f"output/campaign_{campaign_id}_adgroup_{ad_group_id}_keyword_import.csv"
 
     # Read active keywords from export file
-    keywords = read_keyword_export(INPUT_FILE)
+    keywords = read_keyword_export(input_file)
     
     if not keywords:
         print("No active keywords found or error reading input file")
@@ -89,12 +77,12 @@ def main():
     # Generate import file
     generate_import_csv(
         keywords=keywords,
-        output_path=OUTPUT_FILE,
-        campaign_name=NEW_CAMPAIGN_NAME,
-        campaign_id=NEW_CAMPAIGN_ID,
-        ad_group_id=NEW_AD_GROUP_ID,
-        default_bid=DEFAULT_BID,
-        match_type=MATCH_TYPE
+        output_path=output_file,
+        campaign_name=campaign_name,
+        campaign_id=campaign_id,
+        ad_group_id=ad_group_id,
+        default_bid=default_bid,
+        match_type=match_type
     )
 
 if __name__ == "__main__":
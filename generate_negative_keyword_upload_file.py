@@ -1,41 +1,33 @@
-import pandas as pd
+import math
 import os
+from util.keyword_table import KeywordTable
 
 
-def generate_negative_keyword_file():
-	# Define constants
-	CAMPAIGN_ID = 1726069162
-	AD_GROUP_ID = 1725976928
-	MATCH_TYPE = 'EXACT'
+# Define constants
+CAMPAIGN_ID = 1726069162
+AD_GROUP_ID = 1725976928
+MATCH_TYPE = 'EXACT'
+INPUT_FILE = 'output/campaign_1726069162_adgroup_1726011485_keyword_import.csv'
 
-	# Read the input CSV file to get keywords
-	df = pd.read_csv('output/campaign_1726069162_adgroup_1726011485_keyword_import.csv')
 
-	# Get keywords from the input file
-	negative_keywords = df['Keyword'].tolist()
+def generate_negative_keyword_file(input_file=INPUT_FILE, campaign_id=CAMPAIGN_ID, ad_group_id=AD_GROUP_ID,
+								   match_type=MATCH_TYPE, output_file=None):
+	# Read the input CSV file to get keywords
+	keywords = KeywordTable.read_export(input_file)
 
 	# Create output directory if it doesn't exist
 	os.makedirs('output', exist_ok=True)
 
-	# Create data dictionary
-	data = {
-		'Action': ['CREATE'] * len(negative_keywords),
-		'Keyword ID': [''] * len(negative_keywords),
-		'Negative Keyword': negative_keywords,
-		'Match Type': [MATCH_TYPE] * len(negative_keywords),
-		'Campaign ID': [CAMPAIGN_ID] * len(negative_keywords),
-		'Ad Group ID': [AD_GROUP_ID] * len(negative_keywords)  # Empty for campaign level negative keywords
-	}
-
-	# Create DataFrame
-	neg_kw_df = pd.DataFrame(data)
-
 	# Export to CSV
-	output_file = f"output/{CAMPAIGN_ID}_{AD_GROUP_ID}_negative_keyword_import.csv"
-	neg_kw_df.to_csv(output_file, index=False, na_rep='')
+	if not output_file:
+		output_file = f"output/{campaign_id}_{ad_group_id}_negative_keyword_import.csv"
+
+	# Ad Group ID is left empty for campaign level negative keywords
+	negative_keywords = keywords.retarget(campaign_id, ad_group_id or 0, match_type, bid=math.nan)
+	negative_keywords.write_negative_csv(output_file)
 
 	print(f"Successfully generated negative keyword file: {output_file}")
-	print(f"Total negative keywords processed: {len(neg_kw_df)}")
+	print(f"Total negative keywords processed: {len(negative_keywords)}")
 
 
 if __name__ == "__main__":
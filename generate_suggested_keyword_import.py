@@ -1,24 +1,26 @@
-import pandas as pd
 import os
 from util.openai_util import extract_keywords_from_diandian
 from util.csv_util import csv_to_xlsx
+from util.keyword_table import KeywordTable
 
 
-def generate_keyword_import_file():
-    # Define constants
-    CAMPAIGN_ID = 1120711183
-    AD_GROUP_ID = 1120771408
-    MATCH_TYPE = 'EXACT'
-    BID = 1.0
-    INPUT_FILE = 'input/联想词列表.txt'
-    ACTIVE_STATUS = 'ACTIVE'
+# Define constants
+CAMPAIGN_ID = 1120711183
+AD_GROUP_ID = 1120771408
+MATCH_TYPE = 'EXACT'
+BID = 1.0
+INPUT_FILE = 'input/联想词列表.txt'
+ACTIVE_STATUS = 'ACTIVE'
 
+
+def generate_keyword_import_file(input_file=INPUT_FILE, campaign_id=CAMPAIGN_ID, ad_group_id=AD_GROUP_ID,
+                                 match_type=MATCH_TYPE, bid=BID, output_file=None):
     try:
         # Create output directory if it doesn't exist
         os.makedirs('output', exist_ok=True)
         
         # Read the input file
-        with open(INPUT_FILE, 'r', encoding='utf-8') as file:
+        with open(input_file, 'r', encoding='utf-8') as file:
             content = file.read()
         
         # Parse keywords using OpenAI
@@ -32,25 +34,21 @@ def generate_keyword_import_file():
         print(f"Found {len(keywords)} keywords")
         
         # Prepare data for output
-        output_data = []
+        output_data = KeywordTable()
         for keyword in keywords:
-            output_data.append({
-                'Action': 'CREATE',
-                'Keyword ID': '',
-                'Keyword': keyword,
-                'Match Type': MATCH_TYPE,
-                'Status': ACTIVE_STATUS,
-                'Bid': BID,
-                'Campaign ID': CAMPAIGN_ID,
-                'Ad Group ID': AD_GROUP_ID
-            })
-        
-        # Create DataFrame
-        output_df = pd.DataFrame(output_data)
+            output_data.append(
+                keyword=keyword,
+                match_type=match_type,
+                status=ACTIVE_STATUS,
+                bid=bid,
+                campaign_id=campaign_id,
+                ad_group_id=ad_group_id
+            )
         
         # Export to CSV
-        output_file = f"output/{CAMPAIGN_ID}_{AD_GROUP_ID}_suggested_keyword_import.csv"
-        output_df.to_csv(output_file, index=False, na_rep='')
+        if not output_file:
+            output_file = f"output/{campaign_id}_{ad_group_id}_suggested_keyword_import.csv"
+        output_data.write_csv(output_file)
         
         print(f"Successfully generated keyword import files:")
         print(f"CSV: {output_file}")
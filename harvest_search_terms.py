@@ -0,0 +1,88 @@
+import glob
+import os
+from util.search_term_util import (
+    aggregate_search_terms, classify_search_terms, read_existing_keywords, sum_by_term,
+    write_promotion_csv, write_negative_csv
+)
+
+# Configuration
+REPORT_FILES = "input/search_terms_*.csv"
+EXISTING_KEYWORD_FILES = ["input/coin_us_exact.csv"]
+OUTPUT_DIR = "output"
+PROMOTION_BID = 1.0
+# Exact match campaign / ad group for promoted keywords; None keeps each
+# keyword in the campaign and ad group it was found in
+TARGET_CAMPAIGN_ID = None
+TARGET_AD_GROUP_ID = None
+MIN_INSTALLS = 2
+MIN_CONVERSION_RATE = 0.1
+NEGATIVE_MIN_TAPS = 15
+NEGATIVE_MIN_SPEND = 10.0
+
+
+def harvest_search_terms(report_files: str = REPORT_FILES, existing_keyword_files=None,
+                         output_dir: str = OUTPUT_DIR, bid: float = PROMOTION_BID,
+                         min_installs: int = MIN_INSTALLS, min_conversion_rate: float = MIN_CONVERSION_RATE,
+                         negative_min_taps: int = NEGATIVE_MIN_TAPS, negative_min_spend: float = NEGATIVE_MIN_SPEND,
+                         campaign_id: int = TARGET_CAMPAIGN_ID, ad_group_id: int = TARGET_AD_GROUP_ID):
+    """
+    Mine search term reports of BROAD campaigns into EXACT keyword and negative keyword import files.
+    
+    Args:
+        report_files: Glob pattern of search term report CSV files
+        existing_keyword_files: ASA keyword exports whose keywords are not promoted again
+        output_dir: Directory for the generated import files
+        bid: Bid for promoted keywords
+        min_installs: Minimum installs for a term to be promoted
+        min_conversion_rate: Minimum installs / taps for a term to be promoted
+        negative_min_taps: Taps without installs that make a term a negative
+        negative_min_spend: Spend without installs that makes a term a negative
+        campaign_id: Campaign for the promoted EXACT keywords, e.g. an exact match campaign
+        ad_group_id: Ad group for the promoted EXACT keywords, required with campaign_id
+    
+    Negative keywords always go to the campaign and ad group the term was found in.
+    """
+    if (campaign_id is None) != (ad_group_id is None):
+        print("Target campaign ID and ad group ID must be given together")
+        return
+
+    paths = sorted(glob.glob(report_files))
+    if not paths:
+        print(f"No search term reports found matching {report_files}")
+        return
+
+    if existing_keyword_files is None:
+        existing_keyword_files = [path for path in EXISTING_KEYWORD_FILES if os.path.exists(path)]
+    existing_keywords = read_existing_keywords(existing_keyword_files)
+
+    print(f"Aggregating {len(paths)} search term reports...")
+    aggregate = aggregate_search_terms(paths)
+    print(f"Found {len(aggregate)} unique search terms")
+
+    missing_ids = aggregate['campaign_id'].isna() | aggregate['ad_group_id'].isna()
+    if missing_ids.any():
+        print(f"Warning: {int(missing_ids.sum())} search terms have no campaign or ad group ID")
+
+    thresholds = {
+        'existing_keywords': existing_keywords,
+        'min_installs': min_installs,
+        'min_conversion_rate': min_conversion_rate,
+        'negative_min_taps': negative_min_taps,
+        'negative_min_spend': negative_min_spend
+    }
+    promote, negative = classify_search_terms(aggregate, **thresholds)
+    if campaign_id is not None:
+        # Promote on a term's totals across all discovery ad groups
+        promote, _ = classify_search_terms(sum_by_term(aggregate), **thresholds)
+
+    promotion_file = os.path.join(output_dir, "search_term_exact_keyword_import.csv")
+    negative_file = os.path.join(output_dir, "search_term_negative_keyword_import.csv")
+    promoted = write_promotion_csv(promote, promotion_file, bid, campaign_id=campaign_id, ad_group_id=ad_group_id)
+    negatives = write_negative_csv(negative, negative_file)
+
+    print(f"Exact keywords to add: {promoted} -> {promotion_file}")
+    print(f"Negative keywords to add: {negatives} -> {negative_file}")
+
+
+if __name__ == "__main__":
+    harvest_search_terms()
@@ -0,0 +1,104 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+
+CHECKPOINT_DIR = 'output/checkpoints'
+
+
+def checkpoint_path(job_name: str) -> str:
+    """
+    Get the default checkpoint file path for a job.
+
+    Args:
+        job_name: Unique name of the job, e.g. the output file stem
+
+    Returns:
+        Path of the job's append-only checkpoint file
+    """
+    return os.path.join(CHECKPOINT_DIR, f"{job_name}.jsonl")
+
+
+class Checkpoint:
+    """
+    Append-only journal of completed work items for a long-running job.
+
+    Every completed item is written as one JSON line and flushed to disk
+    immediately, so a job killed at any point (crash, Ctrl-C) can be rerun
+    and skip everything that was already recorded.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the checkpoint file and replay existing entries.
+
+        Args:
+            path: Path of the checkpoint file
+        """
+        self.path = path
+        self.entries: Dict[str, Any] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(path):
+            self._load()
+
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self) -> None:
+        """Replay journal entries, ignoring a torn final line from a crash"""
+        with open(self.path, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[entry['key']] = entry.get('value')
+
+        if self.entries:
+            print(f"Resuming from checkpoint {self.path}: {len(self.entries)} items already done")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """Get the recorded value for a completed item"""
+        return self.entries.get(key, default)
+
+    def record(self, key: str, value: Any = None) -> None:
+        """
+        Mark an item as done and durably append it to the journal.
+
+        Args:
+            key: Unique key of the work item
+            value: JSON-serializable result of the item
+        """
+        self._file.write(json.dumps({'key': key, 'value': value}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries[key] = value
+
+    def close(self) -> None:
+        """Close the journal file, keeping it on disk for a later resume"""
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal once the job has fully completed"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
@@ -0,0 +1,237 @@
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from util.metrics_util import timed, increment
+
+# Column headers of the diandian "ASA竞价词" table that precede the records
+TABLE_HEADER = ['关键词', '流行度', '排名', '指数', 'ASA素材数量', '竞价APP数', '竞价占比']
+
+# Shown in the rank column when the app does not rank for the keyword
+NOT_RANKED = '未覆盖'
+
+_INT_RE = re.compile(r'^\d+$')
+_SHARE_RE = re.compile(r'^\d+(\.\d+)?%$')
+
+
+def parse_competitor_dump(content: str) -> List[Dict]:
+    """
+    Parse the ASA bid keyword table copied from a diandian.com app page.
+
+    Each record in the dump is a keyword followed by its popularity, rank
+    (or 未覆盖), search index, ASA creative count, bidding app count, the
+    app name and its bid share. Blank lines are ignored and unexpected
+    lines are skipped until the next well-formed record.
+
+    Args:
+        content: Text content of the dump
+
+    Returns:
+        List of dictionaries with keyword, popularity, rank, search_index and app
+    """
+    lines = [line.strip() for line in content.split('\n')]
+    lines = [line for line in lines if line]
+
+    # Records start right after the table header
+    start = 0
+    for idx in range(len(lines) - len(TABLE_HEADER) + 1):
+        if lines[idx:idx + len(TABLE_HEADER)] == TABLE_HEADER:
+            start = idx + len(TABLE_HEADER)
+            break
+
+    records = []
+    idx = start
+    while idx + 7 < len(lines):
+        keyword, popularity, rank, index, creatives, apps, app, share = lines[idx:idx + 8]
+        if (_INT_RE.match(popularity) and (_INT_RE.match(rank) or rank == NOT_RANKED)
+                and _INT_RE.match(index) and _INT_RE.match(creatives) and _INT_RE.match(apps)
+                and _SHARE_RE.match(share)):
+            records.append({
+                'keyword': keyword.lower(),
+                'popularity': int(popularity),
+                'rank': int(rank) if rank != NOT_RANKED else None,
+                'search_index': int(index),
+                'app': app
+            })
+            idx += 8
+        else:
+            idx += 1
+
+    return records
+
+
+class KeywordMatrix:
+    """
+    Sparse app x keyword matrix over an interned keyword vocabulary.
+
+    Rows are competitor apps and columns are keywords; a cell holds the
+    keyword's popularity for apps that bid on it. Triplets are collected in
+    compact arrays and turned into a SciPy CSR matrix once all apps are added.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.keywords: List[str] = []
+        self.apps: List[str] = []
+        self._rows = array('i')
+        self._cols = array('i')
+        self._data = array('f')
+        self._matrix = None
+
+    def keyword_id(self, keyword: str) -> int:
+        """Get the column of a keyword, adding it to the vocabulary if new"""
+        column = self.vocabulary.get(keyword)
+        if column is None:
+            keyword = sys.intern(keyword)
+            column = len(self.keywords)
+            self.vocabulary[keyword] = column
+            self.keywords.append(keyword)
+        return column
+
+    def add_app(self, app: str, records: Iterable[Dict]) -> None:
+        """
+        Add one competitor app and the keywords it bids on.
+
+        Args:
+            app: App name or identifier
+            records: Parsed records from parse_competitor_dump()
+        """
+        # Duplicate keywords within one dump keep their highest popularity
+        popularity = {}
+        for record in records:
+            keyword = record['keyword']
+            popularity[keyword] = max(popularity.get(keyword, 0), record['popularity'])
+
+        row = len(self.apps)
+        self.apps.append(app)
+        for keyword, value in popularity.items():
+            self._rows.append(row)
+            self._cols.append(self.keyword_id(keyword))
+            # Keep a non-zero weight so structural zeros mean "not bidding"
+            self._data.append(max(value, 1))
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """CSR matrix of shape (apps, keywords), built on first access"""
+        if self._matrix is None:
+            import numpy as np
+            from scipy.sparse import coo_matrix
+
+            self._matrix = coo_matrix(
+                (np.frombuffer(self._data, dtype=np.float32),
+                 (np.frombuffer(self._rows, dtype=np.int32), np.frombuffer(self._cols, dtype=np.int32))),
+                shape=(len(self.apps), len(self.keywords))
+            ).tocsr()
+        return self._matrix
+
+    def keyword_vector(self, keywords: Iterable[str]):
+        """
+        Build a 0/1 vector over the vocabulary for a set of keywords.
+
+        Keywords that no competitor bids on are ignored.
+
+        Args:
+            keywords: Normalized keywords
+
+        Returns:
+            NumPy float array of length len(self.keywords)
+        """
+        import numpy as np
+
+        vector = np.zeros(len(self.keywords), dtype=np.float32)
+        columns = [self.vocabulary[kw] for kw in keywords if kw in self.vocabulary]
+        vector[columns] = 1
+        return vector
+
+
+@timed('competitor_overlap')
+def score_overlap(keyword_matrix: KeywordMatrix, our_keywords: Iterable[str]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Compute per-app overlap with our keywords and rank the gap keywords.
+
+    An app's similarity is the share of its keywords we already bid on. A
+    gap keyword's score is the popularity-weighted sum of the similarities of
+    the apps bidding on it, so keywords used by apps that look like ours rank
+    first.
+
+    Args:
+        keyword_matrix: Competitor apps and their keywords
+        our_keywords: Our own normalized active keywords
+
+    Returns:
+        Tuple of (apps, gaps): per-app overlap statistics sorted by
+        similarity, and keywords we do not bid on sorted by score
+    """
+    import numpy as np
+
+    our_keywords = set(our_keywords)
+    matrix = keyword_matrix.matrix
+    bidding = (matrix > 0).astype(np.float32)
+    ours = keyword_matrix.keyword_vector(our_keywords)
+
+    app_sizes = np.asarray(bidding.sum(axis=1)).ravel()
+    shared = bidding @ ours
+    similarity = np.divide(shared, app_sizes, out=np.zeros_like(shared), where=app_sizes > 0)
+    jaccard_denominator = app_sizes + len(our_keywords) - shared
+    jaccard = np.divide(shared, jaccard_denominator, out=np.zeros_like(shared), where=jaccard_denominator > 0)
+
+    apps = [
+        {
+            'app': keyword_matrix.apps[row],
+            'keywords': int(app_sizes[row]),
+            'shared': int(shared[row]),
+            'similarity': round(float(similarity[row]), 4),
+            'jaccard': round(float(jaccard[row]), 4)
+        }
+        for row in np.argsort(-similarity, kind='stable')
+    ]
+
+    # Small floor so apps with no overlap still contribute their keywords
+    weights = similarity + 0.01
+    scores = matrix.T @ weights
+    app_counts = np.asarray(bidding.sum(axis=0)).ravel()
+    popularity = matrix.max(axis=0).toarray().ravel()
+
+    gap_columns = np.flatnonzero((ours == 0) & (app_counts > 0))
+    gap_columns = gap_columns[np.argsort(-scores[gap_columns], kind='stable')]
+
+    gaps = [
+        {
+            'keyword': keyword_matrix.keywords[column],
+            'score': round(float(scores[column]), 4),
+            'competitor_apps': int(app_counts[column]),
+            'popularity': int(popularity[column])
+        }
+        for column in gap_columns
+    ]
+
+    increment('rows_processed.competitor_overlap', matrix.nnz)
+    return apps, gaps
+
+
+@timed('load_competitor_dumps')
+def load_competitor_dumps(paths: Iterable[str], keyword_matrix: Optional[KeywordMatrix] = None) -> KeywordMatrix:
+    """
+    Parse competitor dump files into a keyword matrix, one app per file.
+
+    Args:
+        paths: Dump files. The app name is taken from the records, falling
+            back to the file name without extension
+        keyword_matrix: Existing matrix to extend
+
+    Returns:
+        KeywordMatrix with one row per dump file
+    """
+    keyword_matrix = keyword_matrix or KeywordMatrix()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            records = parse_competitor_dump(file.read())
+        app_names = Counter(record['app'] for record in records)
+        app = app_names.most_common(1)[0][0] if app_names else os.path.splitext(os.path.basename(path))[0]
+        keyword_matrix.add_app(app, records)
+        increment('bytes_read.load_competitor_dumps', os.path.getsize(path))
+        print(f"Parsed {len(records)} keywords for {app}")
+    return keyword_matrix
@@ -1,8 +1,10 @@
-import pandas as pd
+import csv
 import os
-from typing import Optional
+from typing import Dict, List, Optional
+from util.metrics_util import timed, increment
 
 
+@timed('csv_to_xlsx')
 def csv_to_xlsx(csv_path: str, xlsx_path: Optional[str] = None) -> bool:
     """
     Convert a CSV file to XLSX format.
@@ -14,6 +16,9 @@ def csv_to_xlsx(csv_path: str, xlsx_path: Optional[str] = None) -> bool:
     Returns:
         bool: True if conversion successful, False otherwise
     """
+    # pandas is only needed for the conversion itself
+    import pandas as pd
+
     try:
         if not xlsx_path:
             # Replace .csv with .xlsx in the original path
@@ -27,10 +32,81 @@ def csv_to_xlsx(csv_path: str, xlsx_path: Optional[str] = None) -> bool:
         
         # Write to XLSX
         df.to_excel(xlsx_path, index=False)
+
+        increment('rows_processed.csv_to_xlsx', len(df))
+        increment('bytes_read.csv_to_xlsx', os.path.getsize(csv_path))
+        increment('bytes_written.csv_to_xlsx', os.path.getsize(xlsx_path))
         
         print(f"Successfully converted CSV to XLSX: {xlsx_path}")
         return True
         
     except Exception as e:
         print(f"Error converting CSV to XLSX: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
+
+
+class CsvAppender:
+    """
+    Write CSV rows incrementally, appending to an existing file on resume.
+
+    Rows are flushed as they are written so a partially completed job
+    leaves a valid CSV behind instead of holding everything in memory.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], resume: bool = False):
+        """
+        Open the CSV file for writing.
+
+        Args:
+            path: Path of the output CSV file
+            fieldnames: Column names, written as the header for new files
+            resume: Append to an existing file instead of truncating it
+        """
+        self.path = path
+        self.fieldnames = fieldnames
+        self.rows_written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        has_content = resume and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'a' if has_content else 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+        if not has_content:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def write(self, row: Dict) -> None:
+        """Write a single row and flush it to disk"""
+        self._writer.writerow(row)
+        self._file.flush()
+        self.rows_written += 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> 'CsvAppender':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def read_column_values(csv_path: str, column: str) -> List[str]:
+    """
+    Read all values of one column from a CSV file.
+
+    Args:
+        csv_path: Path to the CSV file
+        column: Name of the column to read
+
+    Returns:
+        List of values, empty if the file does not exist
+    """
+    if not os.path.exists(csv_path):
+        return []
+
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as file:
+        return [row[column] for row in csv.DictReader(file) if row.get(column) is not None]
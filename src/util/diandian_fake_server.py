@@ -0,0 +1,127 @@
+"""
+Local stand-in for the diandian.com data endpoint that replays captured responses.
+
+Responses archived by the HTTP fetch mode (<capture_dir>/snapshots), legacy
+snapshots (diandian_hotwords_<keyword>_<date>.json) or files named
+<keyword>.json are served for the keyword given in the
+"keyword" query parameter or the last path segment. Point the fetcher at it with:
+
+    DIANDIAN_API_URL=http://127.0.0.1:8765/search?keyword={keyword}
+"""
+import argparse
+import glob
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+DEFAULT_PORT = 8765
+
+
+def find_capture(capture_dir: str, keyword: str) -> Optional[str]:
+    """
+    Find the captured response for a keyword, preferring the newest snapshot.
+
+    Args:
+        capture_dir: Directory with captured JSON responses
+        keyword: Seed keyword
+
+    Returns:
+        Path of the capture, None if there is none
+    """
+    exact = os.path.join(capture_dir, f"{keyword}.json")
+    if os.path.exists(exact):
+        return exact
+
+    snapshots = sorted(glob.glob(os.path.join(glob.escape(capture_dir), f"diandian_hotwords_{glob.escape(keyword)}_*.json")))
+    return snapshots[-1] if snapshots else None
+
+
+def find_archived_capture(capture_dir: str, keyword: str) -> Optional[bytes]:
+    """
+    Get the newest archived JSON response for a keyword.
+
+    Args:
+        capture_dir: Directory holding the snapshots/ archive
+        keyword: Seed keyword
+
+    Returns:
+        Response body, None if nothing is archived
+    """
+    archive_dir = os.path.join(capture_dir, 'snapshots')
+    if not os.path.exists(os.path.join(archive_dir, 'index.jsonl')):
+        return None
+
+    from util.snapshot_archive import SnapshotArchive
+
+    archive = SnapshotArchive(archive_dir)
+    entries = archive.find(keyword=keyword, kind='json')
+    if not entries:
+        return None
+    return archive.read(entries[-1]).encode('utf-8')
+
+
+def make_handler(capture_dir: str):
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            keyword = parse_qs(url.query).get('keyword', [None])[0] or unquote(url.path.rstrip('/').split('/')[-1])
+            path = find_capture(capture_dir, keyword)
+
+            if path is not None:
+                with open(path, 'rb') as f:
+                    body = f.read()
+            else:
+                body = find_archived_capture(capture_dir, keyword)
+
+            if body is None:
+                self.send_error(404, f"No capture for {keyword}")
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def start_fake_server(capture_dir: str, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the replay server in a background thread.
+
+    Args:
+        capture_dir: Directory with captured JSON responses
+        port: Port to listen on, 0 picks a free one
+
+    Returns:
+        Tuple of the server (call shutdown() to stop it) and the
+        DIANDIAN_API_URL template pointing at it
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(capture_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url_template = f"http://127.0.0.1:{server.server_address[1]}/search?keyword={{keyword}}"
+    return server, url_template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('capture_dir', nargs='?', default='output', help='Directory with captured responses')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(args.capture_dir))
+    print(f"Replaying {args.capture_dir} at http://127.0.0.1:{args.port}/search?keyword={{keyword}}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
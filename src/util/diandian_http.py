@@ -0,0 +1,235 @@
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from urllib.parse import quote
+from util.metrics_util import timed, increment
+
+# Environment variables configuring the data endpoint behind the hot word page.
+# DIANDIAN_API_URL is a template with a {keyword} placeholder, copied from the
+# request the page makes (browser devtools, network tab). DIANDIAN_COOKIE is
+# the Cookie header of a logged-in browser session.
+API_URL_ENV = 'DIANDIAN_API_URL'
+COOKIE_ENV = 'DIANDIAN_COOKIE'
+
+REQUEST_TIMEOUT = 15
+DEFAULT_MAX_WORKERS = 4
+
+USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+)
+
+# Field names tried, in order, when reading items of the JSON response
+JSON_FIELDS = {
+    'items': ['list', 'items', 'words', 'data'],
+    'keyword': ['keyword', 'word', 'name'],
+    'search_volume': ['search_volume', 'hint', 'search_index', 'index', 'volume'],
+    'rank': ['rank', 'ranking', 'position'],
+    'date': ['date', 'update_date', 'updated_at'],
+}
+
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Load the .env file once, on first use"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+
+def get_api_url(keyword: str) -> Optional[str]:
+    """
+    Get the data endpoint URL for a keyword.
+
+    Args:
+        keyword: Seed keyword
+
+    Returns:
+        URL, or None when DIANDIAN_API_URL is not configured
+    """
+    _load_env()
+    template = os.getenv(API_URL_ENV)
+    if not template:
+        return None
+    return template.format(keyword=quote(keyword))
+
+
+def get_session(max_workers: int = DEFAULT_MAX_WORKERS):
+    """
+    Get the shared requests session, creating it on first use.
+
+    The session keeps a connection pool sized for the fetch concurrency and
+    the cookies of the configured browser session, and is reused for every
+    request of the process. A caller asking for more workers than the pool
+    was sized for gets it enlarged.
+
+    Args:
+        max_workers: Number of concurrent requests the pool should support
+
+    Returns:
+        requests.Session instance
+    """
+    global _session, _session_pool_size
+    with _session_lock:
+        if _session is None:
+            import requests
+
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': USER_AGENT,
+                'Accept': 'application/json, text/plain, */*',
+                'Referer': 'https://app.diandian.com/',
+            })
+            _load_env()
+            cookie = os.getenv(COOKIE_ENV)
+            if cookie:
+                session.headers['Cookie'] = cookie
+            _session = session
+
+        if max_workers > _session_pool_size:
+            from requests.adapters import HTTPAdapter
+
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+            _session_pool_size = max_workers
+    return _session
+
+
+def _first(item: Dict, field: str):
+    for name in JSON_FIELDS[field]:
+        if name in item and item[name] is not None:
+            return item[name]
+    return None
+
+
+def parse_diandian_json(payload: Dict, default_date: Optional[str] = None) -> Optional[Dict]:
+    """
+    Convert the endpoint's JSON response to the parse_diandian_table() structure.
+
+    Args:
+        payload: Decoded JSON response
+        default_date: Date (YYYY-MM-DD) used when the response has none,
+            today if None
+
+    Returns:
+        Dictionary containing date and keywords data if successful, None if failed
+    """
+    data = payload.get('data', payload) if isinstance(payload, dict) else payload
+
+    items = data
+    if isinstance(data, dict):
+        items = _first(data, 'items')
+    if not isinstance(items, list):
+        print("Keyword list not found in JSON response")
+        return None
+
+    latest_date = None
+    if isinstance(data, dict):
+        latest_date = _first(data, 'date')
+
+    keywords = []
+    for position, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            continue
+        keyword = _first(item, 'keyword')
+        if not keyword:
+            continue
+
+        try:
+            volume = int(_first(item, 'search_volume') or 0)
+        except (TypeError, ValueError):
+            volume = 0
+        try:
+            rank = int(_first(item, 'rank') or position)
+        except (TypeError, ValueError):
+            rank = position
+
+        keywords.append({
+            "keyword": str(keyword).strip(),
+            "search_volume": volume,
+            "rank": rank
+        })
+        latest_date = latest_date or _first(item, 'date')
+
+    # Sort keywords by rank
+    keywords.sort(key=lambda x: x["rank"])
+
+    return {
+        "date": str(latest_date)[:10] if latest_date else default_date or datetime.now().strftime("%Y-%m-%d"),
+        "keywords": keywords
+    }
+
+
+def save_response_http(content: str, keyword: str) -> Dict:
+    """Store a raw JSON response in the snapshot archive next to the page snapshots"""
+    from util.snapshot_archive import get_archive
+
+    today = date.today().strftime('%Y%m%d')
+    return get_archive().put(keyword, today, content, kind='json')
+
+
+def fetch_diandian_hot_words_http(keyword: str, max_workers: int = DEFAULT_MAX_WORKERS) -> Optional[Dict]:
+    """
+    Fetch hot keywords from the page's JSON endpoint without a browser.
+
+    Args:
+        keyword: Seed keyword to look up
+        max_workers: Pool size of the shared session
+
+    Returns:
+        Dictionary containing date and keywords data, None if the endpoint
+        is not configured or the request failed
+    """
+    url = get_api_url(keyword)
+    if not url:
+        return None
+
+    try:
+        increment('api_calls.diandian_http')
+        with timed('diandian_http_request'):
+            response = get_session(max_workers).get(url, timeout=REQUEST_TIMEOUT)
+        increment('bytes_read.diandian_http', len(response.content))
+        response.raise_for_status()
+
+        payload = response.json()
+        save_response_http(response.text, keyword)
+        return parse_diandian_json(payload)
+
+    except Exception as e:
+        increment('api_errors.diandian_http')
+        print(f"HTTP fetch failed for '{keyword}': {str(e)}")
+        return None
+
+
+def fetch_many_http(keywords: List[str], max_workers: int = DEFAULT_MAX_WORKERS):
+    """
+    Fetch several keywords over HTTP with bounded concurrency.
+
+    Results are yielded as they complete, so the caller can checkpoint each
+    one immediately. Pending requests are cancelled if the caller stops
+    iterating, e.g. on Ctrl-C.
+
+    Args:
+        keywords: Seed keywords
+        max_workers: Maximum number of requests in flight
+
+    Yields:
+        Tuples of (keyword, result or None)
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {pool.submit(fetch_diandian_hot_words_http, keyword, max_workers): keyword for keyword in keywords}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,11 @@
-import requests
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 import json
-from bs4 import BeautifulSoup
 from datetime import datetime, date
-import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from util.checkpoint_util import Checkpoint, checkpoint_path
+from util.metrics_util import timed, increment
 
 
+@timed('parse_diandian_table')
 def parse_diandian_table(html_content: str) -> Optional[Dict]:
     """
     Parse diandian.com table data using BeautifulSoup
@@ -23,6 +16,9 @@ def parse_diandian_table(html_content: str) -> Optional[Dict]:
     Returns:
         Dictionary containing date and keywords data if successful, None if failed
     """
+    # Imported lazily so loading this module does not pull in the parser stack
+    from bs4 import BeautifulSoup
+
     try:
         soup = BeautifulSoup(html_content, 'html.parser')
         
@@ -88,6 +84,9 @@ def parse_diandian_table(html_content: str) -> Optional[Dict]:
             
         # Sort keywords by rank
         keywords.sort(key=lambda x: x["rank"])
+
+        increment('bytes_read.parse_diandian_table', len(html_content))
+        increment('rows_processed.parse_diandian_table', len(keywords))
         
         return {
             "date": latest_date,
@@ -99,11 +98,21 @@ def parse_diandian_table(html_content: str) -> Optional[Dict]:
         return None
 
 
-def fetch_diandian_hot_words(keyword: str) -> Optional[Dict]:
+def create_chrome_driver():
     """
-    Fetch hot keywords from diandian.com using Selenium
+    Start a headless Chrome driver for diandian.com pages.
+
+    The driver can be passed to fetch_diandian_hot_words_browser() to reuse one
+    browser for many keywords; the caller is responsible for quitting it.
+
+    Returns:
+        Selenium Chrome WebDriver instance
     """
-    url = f'https://app.diandian.com/tool/searchIntelligent-1-24-{keyword}'
+    # Selenium and webdriver_manager are only needed when a browser is started
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
 
     # Setup Chrome options
     chrome_options = Options()
@@ -111,20 +120,71 @@ def fetch_diandian_hot_words(keyword: str) -> Optional[Dict]:
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
 
+    return webdriver.Chrome(
+        service=Service(ChromeDriverManager().install()),
+        options=chrome_options
+    )
+
+
+# Fetch modes: try the JSON endpoint first and fall back to the browser,
+# or use only one of them
+FETCH_MODE_AUTO = 'auto'
+FETCH_MODE_HTTP = 'http'
+FETCH_MODE_BROWSER = 'browser'
+FETCH_MODES = [FETCH_MODE_AUTO, FETCH_MODE_HTTP, FETCH_MODE_BROWSER]
+
+
+def fetch_diandian_hot_words(keyword: str, driver=None, mode: str = FETCH_MODE_AUTO) -> Optional[Dict]:
+    """
+    Fetch hot keywords from diandian.com
+
+    By default the page's JSON endpoint is called directly (see
+    util.diandian_http) and Selenium is only used when that fails or is
+    not configured.
+
+    Args:
+        keyword: Seed keyword to look up
+        driver: Existing Chrome driver to reuse. If None, a new browser is
+            started for this call and quit afterwards
+        mode: One of FETCH_MODES
+    """
+    if mode in (FETCH_MODE_AUTO, FETCH_MODE_HTTP):
+        from util.diandian_http import fetch_diandian_hot_words_http
+        result = fetch_diandian_hot_words_http(keyword)
+        if result or mode == FETCH_MODE_HTTP:
+            return result
+
+    return fetch_diandian_hot_words_browser(keyword, driver)
+
+
+def fetch_diandian_hot_words_browser(keyword: str, driver=None) -> Optional[Dict]:
+    """
+    Fetch hot keywords from diandian.com using Selenium
+
+    Args:
+        keyword: Seed keyword to look up
+        driver: Existing Chrome driver to reuse. If None, a new browser is
+            started for this call and quit afterwards
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    url = f'https://app.diandian.com/tool/searchIntelligent-1-24-{keyword}'
+    owns_driver = driver is None
+
     try:
         # Initialize the Chrome driver
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
+        if owns_driver:
+            driver = create_chrome_driver()
         
-        # Load the page
-        driver.get(url)
-        
-        # Wait for table to be present (adjust timeout as needed)
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "dd-data-table"))
-        )
+        # Load the page and wait for table to be present (adjust timeout as needed)
+        increment('api_calls.diandian_browser')
+        with timed('diandian_page_load'):
+            driver.get(url)
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "dd-data-table"))
+            )
         
         # Get the page source after JavaScript has rendered
         html_content = driver.page_source
@@ -142,28 +202,132 @@ def fetch_diandian_hot_words(keyword: str) -> Optional[Dict]:
         return None
         
     finally:
-        if 'driver' in locals():
+        if owns_driver and driver is not None:
             driver.quit()
 
 
+def fetch_diandian_hot_words_batch(keywords: List[str], job_name: str, driver_factory: Optional[Callable] = None,
+                                   mode: str = FETCH_MODE_AUTO, max_workers: int = 4) -> Dict[str, Dict]:
+    """
+    Fetch hot keywords for many seed keywords with a resumable checkpoint.
+
+    Each successful result is journaled as soon as it is fetched, so an
+    interrupted crawl can be rerun with the same job name and only the
+    remaining keywords are requested. Keywords are first fetched over HTTP
+    with up to max_workers requests in flight; the ones that fail are then
+    fetched one by one in a single shared browser.
+
+    Args:
+        keywords: Seed keywords to crawl
+        job_name: Name of the crawl, used for the checkpoint file
+        driver_factory: Returns the Chrome driver to reuse for browser
+            fetches. If None, a browser is started when first needed and
+            quit at the end
+        mode: One of FETCH_MODES
+        max_workers: Maximum concurrent HTTP requests
+
+    Returns:
+        Dictionary mapping each fetched keyword to its parsed result
+    """
+    checkpoint = Checkpoint(checkpoint_path(job_name))
+    total = len(keywords)
+    owned_driver = None
+
+    pending = []
+    for keyword in keywords:
+        if keyword in checkpoint:
+            increment('cache_hits.diandian_checkpoint')
+        elif keyword not in pending:
+            pending.append(keyword)
+
+    try:
+        if mode in (FETCH_MODE_AUTO, FETCH_MODE_HTTP):
+            from util.diandian_http import fetch_many_http, get_api_url, API_URL_ENV
+
+            if get_api_url('') is None:
+                print(f"{API_URL_ENV} is not set, skipping HTTP fetch")
+                failed = pending
+            else:
+                failed = []
+                for idx, (keyword, result) in enumerate(fetch_many_http(pending, max_workers), 1):
+                    if result:
+                        checkpoint.record(keyword, result)
+                        print(f"Fetched {idx}/{len(pending)} over HTTP: {keyword}")
+                    else:
+                        failed.append(keyword)
+            pending = failed if mode == FETCH_MODE_AUTO else []
+
+        for idx, keyword in enumerate(pending, 1):
+            print(f"Fetching {idx}/{len(pending)} in browser: {keyword}")
+            if driver_factory is not None:
+                driver = driver_factory()
+            else:
+                owned_driver = owned_driver or create_chrome_driver()
+                driver = owned_driver
+
+            result = fetch_diandian_hot_words_browser(keyword, driver=driver)
+            if result:
+                checkpoint.record(keyword, result)
+            else:
+                print(f"Warning: Failed to fetch '{keyword}', it will be retried on the next run")
+
+    except KeyboardInterrupt:
+        print(f"\nInterrupted: {len(checkpoint)}/{total} keywords fetched, rerun to resume")
+        checkpoint.close()
+        raise
+
+    finally:
+        if owned_driver is not None:
+            owned_driver.quit()
+
+    results = {keyword: checkpoint.get(keyword) for keyword in keywords if keyword in checkpoint}
+    if len(results) == len(set(keywords)):
+        checkpoint.discard()
+    else:
+        checkpoint.close()
+
+    return results
+
+
 def save_response_selenium(html_content, keyword):
-    # Create output directory if it doesn't exist
-    os.makedirs('output', exist_ok=True)
-    
+    """Store the rendered page in the compressed snapshot archive"""
+    from util.snapshot_archive import get_archive
+
     # Get today's date in YYYYMMDD format
     today = date.today().strftime('%Y%m%d')
-    
-    # Create filename
-    filename = f'output/diandian_hotwords_{keyword}_{today}.txt'
-    
-    # Save response content to file
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"Response saved to: {filename}")
+
+    entry = get_archive().put(keyword, today, html_content, kind='html')
+    print(f"Response archived: {keyword} {today} ({entry['size']} -> {entry['stored']} bytes)")
+
+
+def reparse_snapshots(archive, keyword: Optional[str] = None, start: Optional[str] = None,
+                      end: Optional[str] = None):
+    """
+    Re-run the parsers over archived snapshots, one snapshot in memory at a time.
+
+    Args:
+        archive: SnapshotArchive to read from
+        keyword: Only this keyword, all if None
+        start: First snapshot date as YYYYMMDD
+        end: Last snapshot date as YYYYMMDD
+
+    Yields:
+        Tuples of (index entry, parsed result or None)
+    """
+    from util.diandian_http import parse_diandian_json
+
+    for entry, content in archive.stream(keyword, start, end):
+        if entry['kind'] == 'json':
+            # Responses without a date belong to the day they were fetched
+            snapshot_date = datetime.strptime(entry['date'], '%Y%m%d').strftime('%Y-%m-%d')
+            try:
+                yield entry, parse_diandian_json(json.loads(content), default_date=snapshot_date)
+            except json.JSONDecodeError:
+                yield entry, None
+        else:
+            yield entry, parse_diandian_table(content)
 
 
-# Example usage
 if __name__ == "__main__":
     keyword = "coin identifier"
     result = fetch_diandian_hot_words(keyword)
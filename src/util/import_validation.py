@@ -0,0 +1,277 @@
+import os
+import re
+from typing import Dict, List, Optional
+from util.metrics_util import timed, increment
+
+# Apple Search Ads limits checked before upload
+MAX_KEYWORDS_PER_AD_GROUP = 5000
+MAX_KEYWORD_LENGTH = 80
+MIN_BID = 0.01
+MAX_BID = 1000.0
+
+# Default number of rows per shard file
+MAX_ROWS_PER_SHARD = 1000
+
+# Errors listed per rule and file; the counts always cover every row
+MAX_ERRORS_PER_RULE = 1000
+
+VALID_ACTIONS = {'CREATE', 'UPDATE', 'DELETE'}
+VALID_MATCH_TYPES = {'EXACT', 'BROAD'}
+
+
+def _file_summary(path: str, layout: Optional[str], rows: int) -> Dict:
+    return {
+        'file': path,
+        'layout': layout,
+        'rows': rows,
+        'valid_rows': 0,
+        'error_counts': {},
+        'errors': [],
+        'shards': []
+    }
+
+
+def _add_errors(summary: Dict, frame, mask, rule: str, column: str, message: str) -> None:
+    """Record every row selected by a boolean mask as one rule violation"""
+    count = int(mask.sum())
+    if not count:
+        return
+    summary['error_counts'][rule] = summary['error_counts'].get(rule, 0) + count
+    for idx in frame.index[mask][:MAX_ERRORS_PER_RULE]:
+        summary['errors'].append({
+            'row': int(idx) + 2,  # 1-based line number after the header
+            'rule': rule,
+            'column': column,
+            'value': frame.at[idx, column] if column in frame.columns else None,
+            'message': message
+        })
+
+
+def validate_import_frame(frame, summary: Dict):
+    """
+    Apply the upload rules to a whole import file at once.
+
+    Rows are checked column-wise with pandas masks. Duplicate (keyword, match
+    type) pairs within an ad group and rows beyond the per-ad-group keyword
+    limit are flagged after the first occurrence / first MAX_KEYWORDS_PER_AD_GROUP
+    rows, so the rows that remain can be uploaded as they are.
+
+    Args:
+        frame: Import file read with every column as a string
+        summary: File summary that receives error counts and errors
+
+    Returns:
+        Boolean mask of the rows that passed every rule
+    """
+    import pandas as pd
+
+    negative = summary['layout'] == 'negative'
+    keyword_column = 'Negative Keyword' if negative else 'Keyword'
+    keyword = frame[keyword_column].str.strip()
+    invalid = pd.Series(False, index=frame.index)
+
+    def check(mask, rule, column, message):
+        nonlocal invalid
+        _add_errors(summary, frame, mask, rule, column, message)
+        invalid |= mask
+
+    check(keyword == '', 'missing_keyword', keyword_column, 'Keyword is empty')
+    check(keyword.str.len() > MAX_KEYWORD_LENGTH, 'keyword_too_long', keyword_column,
+          f'Keyword is longer than {MAX_KEYWORD_LENGTH} characters')
+    check(~frame['Action'].isin(VALID_ACTIONS), 'invalid_action', 'Action',
+          f"Action must be one of {', '.join(sorted(VALID_ACTIONS))}")
+    check(~frame['Match Type'].isin(VALID_MATCH_TYPES), 'invalid_match_type', 'Match Type',
+          f"Match type must be one of {', '.join(sorted(VALID_MATCH_TYPES))}")
+    check(~frame['Campaign ID'].str.isdigit(), 'missing_campaign_id', 'Campaign ID', 'Campaign ID is not a number')
+
+    # Negative keywords may target a whole campaign, keywords always need an ad group
+    ad_group = frame['Ad Group ID']
+    if negative:
+        check((ad_group != '') & ~ad_group.str.isdigit(), 'missing_ad_group_id', 'Ad Group ID',
+              'Ad Group ID is not a number')
+    else:
+        check(~ad_group.str.isdigit(), 'missing_ad_group_id', 'Ad Group ID', 'Ad Group ID is not a number')
+
+        bid = pd.to_numeric(frame['Bid'], errors='coerce')
+        check(bid.isna() | (bid < MIN_BID) | (bid > MAX_BID), 'invalid_bid', 'Bid',
+              f'Bid must be a number between {MIN_BID} and {MAX_BID}')
+
+    # ASA keywords are case-insensitive
+    keys = pd.DataFrame({
+        'campaign_id': frame['Campaign ID'],
+        'ad_group_id': ad_group,
+        'keyword': keyword.str.lower(),
+        'match_type': frame['Match Type']
+    })
+    duplicate = keys[~invalid].duplicated(keep='first').reindex(frame.index, fill_value=False)
+    check(duplicate, 'duplicate_keyword', keyword_column,
+          'Keyword and match type already appear earlier in this ad group')
+
+    position = frame[~invalid].groupby(['Campaign ID', 'Ad Group ID']).cumcount()
+    over_limit = position.reindex(frame.index, fill_value=0) >= MAX_KEYWORDS_PER_AD_GROUP
+    check(over_limit, 'ad_group_limit', keyword_column,
+          f'Ad group already has {MAX_KEYWORDS_PER_AD_GROUP} keywords in this file')
+
+    return ~invalid
+
+
+def _shard_stem(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def clear_shards(path: str, shard_dir: str) -> int:
+    """
+    Delete the shards an earlier run wrote for an import file.
+
+    A rerun may produce fewer parts per ad group, and leftover parts would
+    otherwise be uploaded with the new ones.
+
+    Args:
+        path: Source import file
+        shard_dir: Shard directory
+
+    Returns:
+        Number of files deleted
+    """
+    if not os.path.isdir(shard_dir):
+        return 0
+
+    pattern = re.compile(rf'^{re.escape(_shard_stem(path))}_(campaign_)?\d+_\d{{3}}\.csv$')
+    removed = 0
+    for name in os.listdir(shard_dir):
+        if pattern.match(name):
+            os.remove(os.path.join(shard_dir, name))
+            removed += 1
+    return removed
+
+
+def write_shards(frame, path: str, shard_dir: str, max_rows: int = MAX_ROWS_PER_SHARD) -> List[Dict]:
+    """
+    Split valid rows into upload-sized files, one or more per ad group.
+
+    Args:
+        frame: Valid rows of the import file
+        path: Source file, its name prefixes the shard names
+        shard_dir: Output directory
+        max_rows: Maximum data rows per shard
+
+    Returns:
+        List of dictionaries with path, campaign_id, ad_group_id and rows
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    stem = _shard_stem(path)
+    shards = []
+
+    for (campaign_id, ad_group_id), group in frame.groupby(['Campaign ID', 'Ad Group ID'], sort=True):
+        target = ad_group_id or f"campaign_{campaign_id}"
+        for part, start in enumerate(range(0, len(group), max_rows), 1):
+            shard_path = os.path.join(shard_dir, f"{stem}_{target}_{part:03d}.csv")
+            group.iloc[start:start + max_rows].to_csv(shard_path, index=False, encoding='utf-8', lineterminator='\r\n')
+            shards.append({
+                'path': shard_path,
+                'campaign_id': campaign_id,
+                'ad_group_id': ad_group_id,
+                'rows': min(max_rows, len(group) - start)
+            })
+
+    return shards
+
+
+def check_import_file(path: str, shard_dir: Optional[str] = None, max_rows: int = MAX_ROWS_PER_SHARD) -> Dict:
+    """
+    Validate one keyword or negative keyword import file and optionally shard it.
+
+    Runs in worker processes, so it only returns plain data.
+
+    Args:
+        path: Import CSV path
+        shard_dir: Write the valid rows as shards into this directory, skip if None
+        max_rows: Maximum data rows per shard
+
+    Returns:
+        File summary with row counts, error counts, errors and shards
+    """
+    import pandas as pd
+
+    # Stale shards go first, so a file that now fails entirely leaves none behind
+    if shard_dir:
+        clear_shards(path, shard_dir)
+
+    try:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    except Exception as e:
+        summary = _file_summary(path, None, 0)
+        summary['error_counts']['unreadable_file'] = 1
+        summary['errors'].append({'row': None, 'rule': 'unreadable_file', 'column': None, 'value': None,
+                                  'message': str(e)})
+        return summary
+
+    if 'Negative Keyword' in frame.columns:
+        layout = 'negative'
+        required = ['Action', 'Negative Keyword', 'Match Type', 'Campaign ID', 'Ad Group ID']
+    else:
+        layout = 'keyword'
+        required = ['Action', 'Keyword', 'Match Type', 'Bid', 'Campaign ID', 'Ad Group ID']
+
+    summary = _file_summary(path, layout, len(frame))
+    missing = [column for column in required if column not in frame.columns]
+    if missing:
+        summary['error_counts']['missing_columns'] = 1
+        summary['errors'].append({'row': 1, 'rule': 'missing_columns', 'column': None, 'value': missing,
+                                  'message': f"Missing columns: {', '.join(missing)}"})
+        return summary
+
+    valid = validate_import_frame(frame, summary)
+    summary['valid_rows'] = int(valid.sum())
+    summary['errors'].sort(key=lambda error: (error['row'], error['rule']))
+
+    if shard_dir:
+        summary['shards'] = write_shards(frame[valid], path, shard_dir, max_rows)
+
+    return summary
+
+
+@timed('validate_import_files')
+def check_import_files(paths: List[str], shard_dir: Optional[str] = None, max_rows: int = MAX_ROWS_PER_SHARD,
+                       max_workers: Optional[int] = None) -> Dict:
+    """
+    Validate and shard several import files in parallel, one process per file.
+
+    Args:
+        paths: Import CSV paths
+        shard_dir: Directory for the shards, no shards are written if None
+        max_rows: Maximum data rows per shard
+        max_workers: Number of worker processes, CPU count if None
+
+    Returns:
+        Report with totals and one summary per file, in the order of paths
+    """
+    if len(paths) <= 1 or max_workers == 1:
+        summaries = [check_import_file(path, shard_dir, max_rows) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            summaries = list(pool.map(
+                check_import_file, paths, [shard_dir] * len(paths), [max_rows] * len(paths)
+            ))
+
+    total_rows = sum(summary['rows'] for summary in summaries)
+    total_errors = sum(sum(summary['error_counts'].values()) for summary in summaries)
+    increment('rows_processed.validate_import_files', total_rows)
+
+    return {
+        'limits': {
+            'max_keywords_per_ad_group': MAX_KEYWORDS_PER_AD_GROUP,
+            'max_keyword_length': MAX_KEYWORD_LENGTH,
+            'min_bid': MIN_BID,
+            'max_bid': MAX_BID,
+            'max_rows_per_shard': max_rows
+        },
+        'files': len(summaries),
+        'rows': total_rows,
+        'valid_rows': sum(summary['valid_rows'] for summary in summaries),
+        'errors': total_errors,
+        'shards': sum(len(summary['shards']) for summary in summaries),
+        'results': summaries
+    }
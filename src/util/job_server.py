@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import socket
+import time
+import traceback
+from typing import Callable, Dict, List
+
+# A job handler receives the CLI arguments of one job, e.g. ["convert", "a.csv"]
+JobHandler = Callable[[List[str]], None]
+
+POLL_INTERVAL = 1.0
+
+
+def run_job(handler: JobHandler, job) -> Dict:
+    """
+    Run a single job and describe the outcome.
+
+    Args:
+        handler: Function executing the job's CLI arguments in-process
+        job: Decoded job, expected to be an object with an "argv" list of CLI arguments
+
+    Returns:
+        Result dictionary with status, duration and error message if any
+    """
+    started = time.time()
+    argv = job.get('argv') if isinstance(job, dict) else None
+
+    if not isinstance(argv, list) or not argv:
+        return {'status': 'error', 'error': 'Job must contain a non-empty "argv" list', 'duration_s': 0.0}
+
+    try:
+        handler([str(arg) for arg in argv])
+        result = {'status': 'ok'}
+    except SystemExit as e:
+        # argparse errors and explicit exits must not stop the daemon
+        result = {'status': 'ok' if not e.code else 'error', 'error': None if not e.code else f"exit code {e.code}"}
+    except Exception as e:
+        traceback.print_exc()
+        result = {'status': 'error', 'error': str(e)}
+
+    result['duration_s'] = round(time.time() - started, 3)
+    return result
+
+
+def serve_job_directory(handler: JobHandler, jobs_dir: str) -> None:
+    """
+    Process jobs dropped as JSON files into a directory until interrupted.
+
+    A job file "<name>.json" is moved to jobs_dir/running while it runs and
+    to jobs_dir/done afterwards, next to a "<name>.result.json" file.
+
+    Args:
+        handler: Function executing the job's CLI arguments in-process
+        jobs_dir: Directory to watch for new job files
+    """
+    running_dir = os.path.join(jobs_dir, 'running')
+    done_dir = os.path.join(jobs_dir, 'done')
+    os.makedirs(running_dir, exist_ok=True)
+    os.makedirs(done_dir, exist_ok=True)
+
+    print(f"Watching {jobs_dir} for jobs (Ctrl-C to stop)")
+
+    while True:
+        pending = sorted(name for name in os.listdir(jobs_dir) if name.endswith('.json'))
+        if not pending:
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        for name in pending:
+            job_file = os.path.join(running_dir, name)
+            try:
+                # Claim the job atomically before reading it
+                os.rename(os.path.join(jobs_dir, name), job_file)
+            except OSError:
+                continue
+
+            try:
+                with open(job_file, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                job, result = None, {'status': 'error', 'error': f"Invalid job file: {str(e)}", 'duration_s': 0.0}
+
+            if job is not None:
+                print(f"Running job {name}: {job.get('argv') if isinstance(job, dict) else job}")
+                result = run_job(handler, job)
+
+            stem = os.path.splitext(name)[0]
+            with open(os.path.join(done_dir, f"{stem}.result.json"), 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+            shutil.move(job_file, os.path.join(done_dir, name))
+            print(f"Job {name} finished: {result['status']}")
+
+
+def serve_socket(handler: JobHandler, socket_path: str) -> None:
+    """
+    Accept jobs over a local Unix socket until interrupted.
+
+    Each connection sends one JSON job followed by a newline and receives
+    the JSON result as a single line. Jobs run one at a time so they can
+    share the warm clients held by the handler.
+
+    Args:
+        handler: Function executing the job's CLI arguments in-process
+        socket_path: Filesystem path of the Unix socket to listen on
+    """
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    print(f"Listening on {socket_path} (Ctrl-C to stop)")
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            try:
+                with conn, conn.makefile('rw', encoding='utf-8') as stream:
+                    try:
+                        job = json.loads(stream.readline())
+                        print(f"Running job: {job.get('argv') if isinstance(job, dict) else job}")
+                        result = run_job(handler, job)
+                    except ValueError as e:
+                        result = {'status': 'error', 'error': f"Invalid job: {str(e)}", 'duration_s': 0.0}
+                    stream.write(json.dumps(result) + '\n')
+                    stream.flush()
+            except OSError as e:
+                # A client that went away must not stop the daemon
+                print(f"Could not reply to client: {str(e)}")
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+
+def submit_job(socket_path: str, argv: List[str]) -> Dict:
+    """
+    Send a job to a running daemon and wait for its result.
+
+    Args:
+        socket_path: Path of the daemon's Unix socket
+        argv: CLI arguments of the job
+
+    Returns:
+        Result dictionary reported by the daemon
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        with conn.makefile('rw', encoding='utf-8') as stream:
+            stream.write(json.dumps({'argv': argv}) + '\n')
+            stream.flush()
+            return json.loads(stream.readline())
@@ -0,0 +1,269 @@
+import csv
+import math
+import os
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Column layout of ASA keyword exports and import files
+KEYWORD_COLUMNS = ['Action', 'Keyword ID', 'Keyword', 'Match Type', 'Status', 'Bid', 'Campaign ID', 'Ad Group ID']
+NEGATIVE_COLUMNS = ['Action', 'Keyword ID', 'Negative Keyword', 'Match Type', 'Campaign ID', 'Ad Group ID']
+
+# Stored for ids that are empty in the file, written back as an empty cell
+MISSING_ID = 0
+
+
+class StringTable:
+    """
+    Interned strings addressed by integer id.
+
+    Each distinct string is stored once; tables that share a StringTable can
+    exchange keyword columns as plain integer arrays.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        """Get the id of a string, adding it if it is new"""
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            value = sys.intern(value)
+            self._ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def _parse_id(value: Optional[str]) -> int:
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else MISSING_ID
+
+
+def _parse_bid(value: Optional[str]) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class KeywordTable:
+    """
+    Column-oriented keyword rows in the ASA import/export layout.
+
+    Text columns (action, keyword, match type, status) are integer ids into a
+    StringTable and numeric columns live in typed arrays, so a row costs a few
+    dozen bytes instead of a dict of Python strings. Columns can be handed to
+    pandas without copying through to_dataframe().
+    """
+
+    def __init__(self, strings: Optional[StringTable] = None):
+        """
+        Create an empty table.
+
+        Args:
+            strings: String table to share with other tables, a new one if None
+        """
+        self.strings = strings or StringTable()
+        self.action = array('i')
+        self.keyword_id = array('q')
+        self.keyword = array('i')
+        self.match_type = array('i')
+        self.status = array('i')
+        self.bid = array('d')
+        self.campaign_id = array('q')
+        self.ad_group_id = array('q')
+
+    def __len__(self) -> int:
+        return len(self.keyword)
+
+    def append(self, keyword: str, match_type: str, status: str, bid: float,
+               campaign_id: int, ad_group_id: int, action: str = 'CREATE', keyword_id: int = MISSING_ID) -> None:
+        """
+        Add a row.
+
+        Args:
+            keyword: Keyword text
+            match_type: EXACT or BROAD
+            status: ACTIVE or PAUSED
+            bid: Bid amount, NaN if unknown
+            campaign_id: Campaign ID, MISSING_ID if unknown
+            ad_group_id: Ad group ID, MISSING_ID if unknown
+            action: Import action
+            keyword_id: Existing keyword ID, MISSING_ID for new keywords
+        """
+        intern = self.strings.intern
+        self.action.append(intern(action))
+        self.keyword_id.append(keyword_id)
+        self.keyword.append(intern(keyword))
+        self.match_type.append(intern(match_type))
+        self.status.append(intern(status))
+        self.bid.append(bid)
+        self.campaign_id.append(campaign_id)
+        self.ad_group_id.append(ad_group_id)
+
+    @classmethod
+    def read_export(cls, filepath: str, status: Optional[str] = None,
+                    strings: Optional[StringTable] = None) -> 'KeywordTable':
+        """
+        Stream an ASA keyword export or import CSV into a table.
+
+        Args:
+            filepath: CSV path, with or without a UTF-8 BOM
+            status: Only keep rows with this status, e.g. "ACTIVE"
+            strings: String table to share
+
+        Returns:
+            KeywordTable with the matching rows
+        """
+        table = cls(strings)
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as file:
+            for row in csv.DictReader(file):
+                row_status = row.get('Status') or ''
+                if status is not None and row_status != status:
+                    continue
+                table.append(
+                    keyword=row['Keyword'],
+                    match_type=row.get('Match Type') or '',
+                    status=row_status,
+                    bid=_parse_bid(row.get('Bid')),
+                    campaign_id=_parse_id(row.get('Campaign ID')),
+                    ad_group_id=_parse_id(row.get('Ad Group ID')),
+                    action=row.get('Action') or '',
+                    keyword_id=_parse_id(row.get('Keyword ID'))
+                )
+        return table
+
+    def keywords(self) -> Iterator[str]:
+        """Iterate over the keyword text of every row"""
+        strings = self.strings.strings
+        return (strings[keyword] for keyword in self.keyword)
+
+    def retarget(self, campaign_id: int, ad_group_id: int, match_type: str, bid: float,
+                 status: str = 'ACTIVE', action: str = 'CREATE') -> 'KeywordTable':
+        """
+        Build new-keyword rows for the same keywords in another campaign / ad group.
+
+        The keyword column is copied as an integer array and the string table
+        is shared, so no keyword text is duplicated.
+
+        Returns:
+            New KeywordTable sharing this table's strings
+        """
+        count = len(self)
+        table = KeywordTable(self.strings)
+        intern = self.strings.intern
+        table.keyword = array('i', self.keyword)
+        table.action = array('i', [intern(action)]) * count
+        table.keyword_id = array('q', [MISSING_ID]) * count
+        table.match_type = array('i', [intern(match_type)]) * count
+        table.status = array('i', [intern(status)]) * count
+        table.bid = array('d', [bid]) * count
+        table.campaign_id = array('q', [campaign_id]) * count
+        table.ad_group_id = array('q', [ad_group_id]) * count
+        return table
+
+    def rows(self, bid_format: str = '{}') -> Iterator[Tuple]:
+        """
+        Iterate over rows in KEYWORD_COLUMNS order, formatted for CSV output.
+
+        Args:
+            bid_format: Format string for the bid, e.g. "{:.2f}"
+        """
+        strings = self.strings.strings
+        for idx in range(len(self)):
+            bid = self.bid[idx]
+            yield (
+                strings[self.action[idx]],
+                self.keyword_id[idx] or '',
+                strings[self.keyword[idx]],
+                strings[self.match_type[idx]],
+                strings[self.status[idx]],
+                '' if math.isnan(bid) else bid_format.format(bid),
+                self.campaign_id[idx] or '',
+                self.ad_group_id[idx] or ''
+            )
+
+    def write_csv(self, output_path: str, bid_format: str = '{}') -> None:
+        """
+        Write the table as an ASA keyword import CSV.
+
+        Args:
+            output_path: Output CSV path
+            bid_format: Format string for the bid, e.g. "{:.2f}"
+        """
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(output_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(KEYWORD_COLUMNS)
+            writer.writerows(self.rows(bid_format))
+
+    def write_negative_csv(self, output_path: str) -> None:
+        """
+        Write the table as an ASA negative keyword import CSV.
+
+        Args:
+            output_path: Output CSV path
+        """
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        strings = self.strings.strings
+        with open(output_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(NEGATIVE_COLUMNS)
+            for idx in range(len(self)):
+                writer.writerow([
+                    strings[self.action[idx]],
+                    self.keyword_id[idx] or '',
+                    strings[self.keyword[idx]],
+                    strings[self.match_type[idx]],
+                    self.campaign_id[idx] or '',
+                    self.ad_group_id[idx] or ''
+                ])
+
+    def to_dataframe(self):
+        """
+        Expose the table as a pandas DataFrame in KEYWORD_COLUMNS layout.
+
+        Numeric columns are zero-copy views of the arrays and text columns are
+        categoricals whose codes are the string ids, so the keyword text is
+        not copied per row. Missing ids are 0 in the ID columns.
+
+        While the DataFrame (or any view of its columns) is alive, the table
+        cannot grow: append() raises BufferError because the arrays are
+        exporting their buffers. Keep to_dataframe().copy() instead when
+        rows are appended afterwards.
+
+        Returns:
+            pandas DataFrame
+        """
+        import numpy as np
+        import pandas as pd
+
+        categories = pd.Index(self.strings.strings, dtype=object)
+
+        def text_column(ids: array):
+            return pd.Categorical.from_codes(np.frombuffer(ids, dtype=np.int32), categories=categories)
+
+        return pd.DataFrame({
+            'Action': text_column(self.action),
+            'Keyword ID': np.frombuffer(self.keyword_id, dtype=np.int64),
+            'Keyword': text_column(self.keyword),
+            'Match Type': text_column(self.match_type),
+            'Status': text_column(self.status),
+            'Bid': np.frombuffer(self.bid, dtype=np.float64),
+            'Campaign ID': np.frombuffer(self.campaign_id, dtype=np.int64),
+            'Ad Group ID': np.frombuffer(self.ad_group_id, dtype=np.int64),
+        }, copy=False)
@@ -0,0 +1,219 @@
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from datetime import datetime
+from typing import Dict, Optional
+
+# Per-stage timings and free-form counters collected during a run
+_stages: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, float] = {}
+_lock = threading.Lock()
+_started_at = time.time()
+
+# Directory for per-stage cProfile dumps, None when profiling is off
+DEFAULT_PROFILE_DIR: Optional[str] = os.getenv('ASA_HELPER_PROFILE_DIR') or None
+_profile_dir = DEFAULT_PROFILE_DIR
+_profiling_active = False
+
+# One profiler per stage, accumulating every call of the stage
+_profiles: Dict[str, object] = {}
+
+
+def enable_profiling(profile_dir: Optional[str]) -> None:
+    """
+    Dump a cProfile file per stage into profile_dir.
+
+    Profiles can also be enabled by setting ASA_HELPER_PROFILE_DIR. Only one
+    stage is profiled at a time, the outermost one of the thread that got
+    there first, so nested stages show up inside their parent's profile.
+    Profiles accumulate in memory and are written by dump_profiles(), each
+    file covering all profiled calls of its stage.
+
+    Args:
+        profile_dir: Directory to write <stage>.prof files into, None turns profiling off
+    """
+    global _profile_dir
+    _profile_dir = profile_dir
+
+
+def increment(name: str, amount: float = 1) -> None:
+    """
+    Add to a named counter.
+
+    Counter names are "<metric>.<stage>", e.g. "rows_processed.read_keyword_export",
+    so they can be exported with a stage label.
+
+    Args:
+        name: Counter name
+        amount: Value to add
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+class timed(ContextDecorator):
+    """
+    Time a pipeline stage, usable as a context manager or decorator.
+
+    Example:
+        with timed('csv_to_xlsx'):
+            ...
+
+        @timed('parse_diandian_table')
+        def parse_diandian_table(...):
+            ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._profiler = None
+
+    def _recreate_cm(self) -> 'timed':
+        # Each call of a decorated function gets its own instance, so
+        # overlapping calls from several threads keep separate state
+        return type(self)(self.stage)
+
+    def __enter__(self) -> 'timed':
+        global _profiling_active
+        if _profile_dir:
+            with _lock:
+                if not _profiling_active:
+                    import cProfile
+                    _profiling_active = True
+                    self._profiler = _profiles.setdefault(self.stage, cProfile.Profile())
+            if self._profiler is not None:
+                self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        global _profiling_active
+        elapsed = time.perf_counter() - self._start
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+            with _lock:
+                _profiling_active = False
+
+        with _lock:
+            stats = _stages.setdefault(self.stage, {'calls': 0, 'errors': 0, 'total_s': 0.0, 'max_s': 0.0})
+            stats['calls'] += 1
+            stats['total_s'] += elapsed
+            stats['max_s'] = max(stats['max_s'], elapsed)
+            if exc_type is not None:
+                stats['errors'] += 1
+        return False
+
+
+def dump_profiles() -> None:
+    """
+    Write the accumulated profile of each stage to <profile_dir>/<stage>.prof.
+
+    Called once at the end of a run or daemon job rather than per call, so
+    writing the profiles does not skew the stages being measured. Runs at
+    exit as well, for scripts profiled through ASA_HELPER_PROFILE_DIR.
+    """
+    with _lock:
+        profiles = dict(_profiles)
+    if not _profile_dir or not profiles:
+        return
+
+    os.makedirs(_profile_dir, exist_ok=True)
+    for stage, profiler in profiles.items():
+        profiler.dump_stats(os.path.join(_profile_dir, f"{stage}.prof"))
+
+
+atexit.register(dump_profiles)
+
+
+def get_report() -> Dict:
+    """
+    Build the run report from everything collected so far.
+
+    Returns:
+        Dictionary with run metadata, per-stage timings and counters
+    """
+    with _lock:
+        stages = {
+            stage: dict(stats, total_s=round(stats['total_s'], 6), max_s=round(stats['max_s'], 6))
+            for stage, stats in _stages.items()
+        }
+        counters = dict(_counters)
+
+    return {
+        'started_at': datetime.fromtimestamp(_started_at).isoformat(timespec='seconds'),
+        'duration_s': round(time.time() - _started_at, 3),
+        'stages': stages,
+        'counters': counters
+    }
+
+
+def reset() -> None:
+    """Clear all collected metrics, e.g. between daemon jobs"""
+    global _started_at
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+        _profiles.clear()
+        _started_at = time.time()
+
+
+def write_report(path: str) -> None:
+    """
+    Write the run report as JSON.
+
+    Args:
+        path: Output JSON file path
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(get_report(), f, indent=2)
+    print(f"Run report saved to: {path}")
+
+
+def write_prometheus_textfile(path: str) -> None:
+    """
+    Write the metrics in Prometheus text format for the node_exporter textfile collector.
+
+    The file is written to a temporary name and renamed so the collector
+    never reads a partial file.
+
+    Args:
+        path: Output .prom file path
+    """
+    report = get_report()
+    lines = [
+        '# TYPE asa_helper_stage_calls_total counter',
+        '# TYPE asa_helper_stage_errors_total counter',
+        '# TYPE asa_helper_stage_seconds_total counter',
+        '# TYPE asa_helper_stage_max_seconds gauge',
+    ]
+    for stage, stats in sorted(report['stages'].items()):
+        lines.append(f'asa_helper_stage_calls_total{{stage="{stage}"}} {stats["calls"]}')
+        lines.append(f'asa_helper_stage_errors_total{{stage="{stage}"}} {stats["errors"]}')
+        lines.append(f'asa_helper_stage_seconds_total{{stage="{stage}"}} {stats["total_s"]}')
+        lines.append(f'asa_helper_stage_max_seconds{{stage="{stage}"}} {stats["max_s"]}')
+
+    for name, value in sorted(report['counters'].items()):
+        metric, _, stage = name.partition('.')
+        labels = f'{{stage="{stage}"}}' if stage else ''
+        lines.append(f'asa_helper_{metric}_total{labels} {value}')
+
+    lines.append(f'asa_helper_run_duration_seconds {report["duration_s"]}')
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
+    print(f"Prometheus metrics saved to: {path}")
@@ -1,11 +1,30 @@
-from openai import OpenAI
 import os
 from typing import Optional, List
 from enum import Enum, auto
-from dotenv import load_dotenv
+from util.metrics_util import timed, increment
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+# Created on first use so importing this module stays cheap
+_client = None
+
+
+def get_client():
+    """
+    Get the shared OpenAI client, creating it on first use.
+
+    Loading the .env file and importing the openai package are deferred
+    until a request is actually made.
+
+    Returns:
+        OpenAI client instance
+    """
+    global _client
+    if _client is None:
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        load_dotenv()
+        _client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _client
 
 
 class Role(Enum):
@@ -98,25 +117,31 @@ def process_with_ai(text: str, role: Role, task: Task, **kwargs) -> Optional[str
         system_context = get_system_context(role)
         task_instruction = get_task_instruction(task, **kwargs)
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # or your specific model name
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"Your role:{system_context}\n\nYour task:{task_instruction}"
-                },
-                {
-                    "role": "user",
-                    "content": text
-                }
-            ],
-            temperature=0.1,
-            max_tokens=1000
-        )
+        increment('api_calls.openai')
+        with timed('process_with_ai'):
+            response = get_client().chat.completions.create(
+                model="gpt-4o-mini",  # or your specific model name
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"Your role:{system_context}\n\nYour task:{task_instruction}"
+                    },
+                    {
+                        "role": "user",
+                        "content": text
+                    }
+                ],
+                temperature=0.1,
+                max_tokens=1000
+            )
         
+        if getattr(response, 'usage', None):
+            increment('tokens.openai', response.usage.total_tokens)
+
         return response.choices[0].message.content.strip()
     
     except Exception as e:
+        increment('api_errors.openai')
         print(f"Processing error: {str(e)}")
         return None
 
@@ -0,0 +1,221 @@
+import csv
+import math
+from typing import Dict, Iterable, List, Optional, Set
+from util.metrics_util import timed, increment
+from util.keyword_table import KeywordTable, MISSING_ID
+
+# Columns of the ASA search term report and the names used internally
+SEARCH_TERM_COLUMNS = {
+    'Search Term': 'term',
+    'Campaign ID': 'campaign_id',
+    'Ad Group ID': 'ad_group_id',
+    'Impressions': 'impressions',
+    'Taps': 'taps',
+    'Installs': 'installs',
+    'Spend': 'spend',
+}
+
+KEY_COLUMNS = ['campaign_id', 'ad_group_id', 'term']
+METRIC_COLUMNS = ['impressions', 'taps', 'installs', 'spend']
+
+# Rows read per chunk; memory is bounded by the chunk plus the distinct terms
+CHUNK_SIZE = 500_000
+
+
+def _aggregate(df):
+    """Sum the metrics of a frame per campaign, ad group and term"""
+    # Rows without a campaign or ad group id are kept as their own group
+    return df.groupby(KEY_COLUMNS, sort=False, as_index=False, dropna=False)[METRIC_COLUMNS].sum()
+
+
+@timed('aggregate_search_terms')
+def aggregate_search_terms(paths: Iterable[str], columns: Optional[Dict[str, str]] = None,
+                           chunk_size: int = CHUNK_SIZE):
+    """
+    Stream search term reports and aggregate them by normalized term.
+
+    Each file is read in chunks; every chunk is normalized and grouped with
+    pandas and folded into a running aggregate, so only one chunk of raw
+    rows is held in memory at a time.
+
+    Args:
+        paths: Search term report CSV files
+        columns: Mapping of report column names to internal names, defaults
+            to SEARCH_TERM_COLUMNS
+        chunk_size: Number of report rows per chunk
+
+    Returns:
+        DataFrame with one row per (campaign_id, ad_group_id, term) and the
+        summed impressions, taps, installs and spend
+    """
+    import pandas as pd
+
+    columns = columns or SEARCH_TERM_COLUMNS
+    partials = []
+    aggregate = None
+
+    for path in paths:
+        reader = pd.read_csv(
+            path,
+            usecols=list(columns),
+            # Keep ids as text so they are written back exactly as exported
+            dtype={name: 'string' for name, internal in columns.items() if internal in KEY_COLUMNS},
+            encoding='utf-8-sig',
+            chunksize=chunk_size
+        )
+        for chunk in reader:
+            chunk = chunk.rename(columns=columns)
+            increment('rows_processed.aggregate_search_terms', len(chunk))
+
+            # Normalize terms the same way keywords are deduplicated elsewhere
+            chunk['term'] = chunk['term'].str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+            chunk = chunk[chunk['term'].notna() & (chunk['term'] != '')]
+            chunk[METRIC_COLUMNS] = chunk[METRIC_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+            partials.append(_aggregate(chunk))
+
+            # Fold partial results periodically to keep memory flat
+            if len(partials) >= 8:
+                aggregate = _aggregate(pd.concat(([aggregate] if aggregate is not None else []) + partials))
+                partials = []
+
+    frames = ([aggregate] if aggregate is not None else []) + partials
+    if not frames:
+        return pd.DataFrame(columns=KEY_COLUMNS + METRIC_COLUMNS)
+
+    return _aggregate(pd.concat(frames, ignore_index=True))
+
+
+def sum_by_term(aggregate):
+    """
+    Sum aggregated search terms across campaigns and ad groups.
+
+    Used when promoted keywords all go to one target ad group, so a term is
+    judged on its totals rather than on each discovery ad group separately.
+
+    Args:
+        aggregate: Output of aggregate_search_terms()
+
+    Returns:
+        DataFrame with one row per term, campaign_id and ad_group_id empty
+    """
+    totals = aggregate.groupby('term', sort=False, as_index=False)[METRIC_COLUMNS].sum()
+    return totals.assign(campaign_id='', ad_group_id='')[KEY_COLUMNS + METRIC_COLUMNS]
+
+
+@timed('classify_search_terms')
+def classify_search_terms(aggregate, existing_keywords: Optional[Set[str]] = None,
+                          min_installs: int = 2, min_conversion_rate: float = 0.1,
+                          negative_min_taps: int = 15, negative_min_spend: float = 10.0):
+    """
+    Split aggregated search terms into promotion and negative candidates.
+
+    A term is promoted to an EXACT keyword when it has at least min_installs
+    installs and a tap-to-install rate of at least min_conversion_rate. A term
+    becomes a negative candidate when it has no installs after
+    negative_min_taps taps or negative_min_spend spend. Terms that already
+    exist as keywords are never promoted.
+
+    Args:
+        aggregate: Output of aggregate_search_terms()
+        existing_keywords: Normalized keywords already in the account
+        min_installs: Minimum installs for promotion
+        min_conversion_rate: Minimum installs / taps for promotion
+        negative_min_taps: Taps without installs that make a term negative
+        negative_min_spend: Spend without installs that makes a term negative
+
+    Returns:
+        Tuple of (promote, negative) DataFrames, sorted by installs and spend
+    """
+    taps = aggregate['taps'].where(aggregate['taps'] > 0)
+    conversion_rate = (aggregate['installs'] / taps).fillna(0)
+
+    promote_mask = (aggregate['installs'] >= min_installs) & (conversion_rate >= min_conversion_rate)
+    if existing_keywords:
+        promote_mask &= ~aggregate['term'].isin(existing_keywords)
+
+    negative_mask = (aggregate['installs'] == 0) & (
+        (aggregate['taps'] >= negative_min_taps) | (aggregate['spend'] >= negative_min_spend)
+    )
+
+    promote = aggregate[promote_mask].assign(conversion_rate=conversion_rate[promote_mask])
+    promote = promote.sort_values(['installs', 'conversion_rate'], ascending=False)
+    negative = aggregate[negative_mask].sort_values('spend', ascending=False)
+
+    return promote, negative
+
+
+def _to_keyword_table(candidates, match_type: str, bid: float) -> KeywordTable:
+    """Convert candidate rows into new-keyword rows"""
+    table = KeywordTable()
+    for campaign_id, ad_group_id, term in candidates[KEY_COLUMNS].itertuples(index=False):
+        table.append(
+            keyword=term,
+            match_type=match_type,
+            status='ACTIVE',
+            bid=bid,
+            campaign_id=int(campaign_id) if str(campaign_id).isdigit() else MISSING_ID,
+            ad_group_id=int(ad_group_id) if str(ad_group_id).isdigit() else MISSING_ID
+        )
+    return table
+
+
+def write_promotion_csv(promote, output_path: str, bid: float, match_type: str = 'EXACT',
+                        campaign_id: Optional[int] = None, ad_group_id: Optional[int] = None) -> int:
+    """
+    Write promotion candidates in the keyword import format of generate_import_csv().
+
+    Args:
+        promote: Promotion candidates from classify_search_terms()
+        output_path: Output CSV path
+        bid: Bid for the new keywords
+        match_type: Match type of the new keywords
+        campaign_id: Target campaign, e.g. an exact match campaign. If None,
+            each keyword goes to the campaign and ad group it was found in
+        ad_group_id: Target ad group, required with campaign_id
+
+    Returns:
+        Number of rows written
+    """
+    if campaign_id is not None:
+        # A term found in several discovery ad groups is added only once;
+        # pass candidates classified on sum_by_term() totals
+        promote = promote.drop_duplicates('term')
+        table = _to_keyword_table(promote, match_type, bid).retarget(campaign_id, ad_group_id, match_type, bid)
+    else:
+        table = _to_keyword_table(promote, match_type, bid)
+    table.write_csv(output_path, bid_format='{:.2f}')
+    return len(table)
+
+
+def write_negative_csv(negative, output_path: str, match_type: str = 'EXACT') -> int:
+    """
+    Write negative candidates in the format of generate_negative_keyword_upload_file.py.
+
+    Args:
+        negative: Negative candidates from classify_search_terms()
+        output_path: Output CSV path
+        match_type: Match type of the negative keywords
+
+    Returns:
+        Number of rows written
+    """
+    _to_keyword_table(negative, match_type, math.nan).write_negative_csv(output_path)
+    return len(negative)
+
+
+def read_existing_keywords(export_paths: List[str]) -> Set[str]:
+    """
+    Read the normalized keywords of ASA keyword exports, regardless of status.
+
+    Args:
+        export_paths: ASA keyword export CSV files
+
+    Returns:
+        Set of normalized keywords
+    """
+    keywords = set()
+    for path in export_paths:
+        with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+            keywords.update(' '.join(row['Keyword'].lower().split()) for row in csv.DictReader(file))
+    return keywords
@@ -0,0 +1,413 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from util.metrics_util import timed, increment
+
+ARCHIVE_DIR = 'output/snapshots'
+
+# zstd level used for new objects; higher levels mostly cost write time
+COMPRESSION_LEVEL = 10
+
+# Size of the trained dictionary holding the shared app-shell markup
+DICTIONARY_SIZE = 112 * 1024
+
+# Number of snapshots sampled to train a dictionary
+TRAINING_SAMPLES = 200
+
+# Pages stored without a dictionary before one is trained automatically
+AUTO_TRAIN_PAGES = 50
+
+# File names written by save_response_selenium() / save_response_http()
+LEGACY_FILE_RE = re.compile(r'^diandian_hotwords_(?P<keyword>.+)_(?P<date>\d{8})\.(?P<ext>txt|json)$')
+
+# Snapshot kind by legacy file extension
+KIND_BY_EXTENSION = {'txt': 'html', 'json': 'json'}
+
+
+class SnapshotArchive:
+    """
+    Content-addressed, zstd-compressed store of raw diandian snapshots.
+
+    Each distinct page is stored once under objects/<digest[:2]>/<digest>.zst,
+    compressed with a dictionary trained on earlier pages so the markup that
+    every page shares costs almost nothing. index.jsonl is an append-only
+    journal mapping (keyword, date, kind) to an object digest.
+
+    Until a dictionary exists, pages are compressed on their own; once
+    AUTO_TRAIN_PAGES such pages are stored, put() trains one from a sample
+    of them. "asa_helper.py snapshots train" retrains on demand.
+    """
+
+    def __init__(self, root: str = ARCHIVE_DIR, level: int = COMPRESSION_LEVEL):
+        """
+        Open (or create) an archive.
+
+        Args:
+            root: Archive directory
+            level: zstd compression level for new objects
+        """
+        self.root = root
+        self.level = level
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self.dictionary_dir = os.path.join(root, 'dictionaries')
+        self.entries: Dict[Tuple[str, str, str], Dict] = {}
+        self._object_dictionaries: Dict[str, Optional[str]] = {}
+        self._auto_train_failed = False
+        self.dictionary_id: Optional[str] = None
+        self._dictionaries: Dict[str, object] = {}
+        self._decompressors: Dict[Optional[str], object] = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        os.makedirs(self.dictionary_dir, exist_ok=True)
+        self._load_index()
+
+        current = os.path.join(self.dictionary_dir, 'CURRENT')
+        if os.path.exists(current):
+            with open(current, 'r', encoding='utf-8') as f:
+                self.dictionary_id = f.read().strip() or None
+
+    def _load_index(self) -> None:
+        """Replay the index journal, ignoring a torn final line"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[(entry['keyword'], entry['date'], entry['kind'])] = entry
+                self._object_dictionaries[entry['digest']] = entry['dict']
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.zst")
+
+    def _dictionary(self, dictionary_id: str):
+        """Load a trained dictionary by id"""
+        import zstandard
+
+        if dictionary_id not in self._dictionaries:
+            with open(os.path.join(self.dictionary_dir, f"{dictionary_id}.zdict"), 'rb') as f:
+                self._dictionaries[dictionary_id] = zstandard.ZstdCompressionDict(f.read())
+        return self._dictionaries[dictionary_id]
+
+    def _decompressor(self, dictionary_id: Optional[str]):
+        import zstandard
+
+        if dictionary_id not in self._decompressors:
+            if dictionary_id:
+                self._decompressors[dictionary_id] = zstandard.ZstdDecompressor(
+                    dict_data=self._dictionary(dictionary_id)
+                )
+            else:
+                self._decompressors[dictionary_id] = zstandard.ZstdDecompressor()
+        return self._decompressors[dictionary_id]
+
+    def train_dictionary(self, samples: List[bytes], size: int = DICTIONARY_SIZE) -> str:
+        """
+        Train a zstd dictionary on sample snapshots and use it for new objects.
+
+        Objects written earlier keep the dictionary they were compressed with.
+
+        Args:
+            samples: Raw snapshot contents
+            size: Dictionary size in bytes
+
+        Returns:
+            Id of the new dictionary
+        """
+        import zstandard
+
+        dictionary = zstandard.train_dictionary(size, samples)
+        data = dictionary.as_bytes()
+        dictionary_id = hashlib.sha256(data).hexdigest()[:16]
+
+        with open(os.path.join(self.dictionary_dir, f"{dictionary_id}.zdict"), 'wb') as f:
+            f.write(data)
+        with open(os.path.join(self.dictionary_dir, 'CURRENT'), 'w', encoding='utf-8') as f:
+            f.write(dictionary_id)
+
+        self.dictionary_id = dictionary_id
+        print(f"Trained snapshot dictionary {dictionary_id} on {len(samples)} samples ({len(data)} bytes)")
+        return dictionary_id
+
+    def train_from_archive(self, kind: str = 'html', samples: int = TRAINING_SAMPLES) -> Optional[str]:
+        """
+        Train a dictionary on an evenly spaced sample of archived snapshots.
+
+        At most `samples` snapshots are decompressed, however large the
+        archive has grown.
+
+        Args:
+            kind: Snapshot kind to sample
+            samples: Maximum number of snapshots to sample
+
+        Returns:
+            Id of the new dictionary, None if there is nothing to train on
+        """
+        entries = list({entry['digest']: entry for entry in self.find(kind=kind)}.values())
+        if not entries:
+            return None
+        step = max(1, len(entries) // samples)
+        return self.train_dictionary([self.read(entry).encode('utf-8') for entry in entries[::step][:samples]])
+
+    def _untrained_pages(self) -> int:
+        return len({
+            entry['digest'] for entry in self.entries.values()
+            if entry['kind'] == 'html' and entry['dict'] is None
+        })
+
+    def _auto_train(self) -> None:
+        """Train the first dictionary once enough pages are stored without one"""
+        if self.dictionary_id is not None or self._auto_train_failed:
+            return
+        if self._untrained_pages() < AUTO_TRAIN_PAGES:
+            return
+
+        import zstandard
+
+        try:
+            self.train_from_archive()
+        except zstandard.ZstdError as e:
+            # Too little or too uniform data; keep storing pages without one
+            self._auto_train_failed = True
+            print(f"Warning: could not train a snapshot dictionary: {str(e)}")
+
+    @timed('snapshot_put')
+    def put(self, keyword: str, snapshot_date: str, content, kind: str = 'html') -> Dict:
+        """
+        Store a snapshot, writing the object only if its content is new.
+
+        Args:
+            keyword: Seed keyword of the page
+            snapshot_date: Date as YYYYMMDD
+            content: Raw page content (str or bytes)
+            kind: "html" for rendered pages, "json" for endpoint responses
+
+        Returns:
+            Index entry of the snapshot
+        """
+        import zstandard
+
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+
+        with self._lock:
+            if os.path.exists(path):
+                increment('cache_hits.snapshot_dedup')
+                stored, dictionary_id = os.path.getsize(path), self._object_dictionaries.get(digest)
+            else:
+                dictionary_id = self.dictionary_id
+                params = {'level': self.level}
+                if dictionary_id:
+                    params['dict_data'] = self._dictionary(dictionary_id)
+                compressed = zstandard.ZstdCompressor(**params).compress(data)
+
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+                stored = len(compressed)
+                increment('bytes_written.snapshot_put', stored)
+
+            entry = {
+                'keyword': keyword,
+                'date': snapshot_date,
+                'kind': kind,
+                'digest': digest,
+                'size': len(data),
+                'stored': stored,
+                'dict': dictionary_id
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.entries[(keyword, snapshot_date, kind)] = entry
+            self._object_dictionaries[digest] = dictionary_id
+
+            if kind == 'html' and dictionary_id is None:
+                self._auto_train()
+
+        return entry
+
+    def read(self, entry: Dict) -> str:
+        """
+        Decompress the content of an index entry.
+
+        Args:
+            entry: Index entry from find() or entries
+
+        Returns:
+            Snapshot content
+        """
+        with open(self._object_path(entry['digest']), 'rb') as f:
+            compressed = f.read()
+        increment('bytes_read.snapshot_read', len(compressed))
+        return self._decompressor(entry['dict']).decompress(compressed).decode('utf-8')
+
+    def get(self, keyword: str, snapshot_date: str, kind: str = 'html') -> Optional[str]:
+        """
+        Get a single snapshot.
+
+        Args:
+            keyword: Seed keyword
+            snapshot_date: Date as YYYYMMDD
+            kind: "html" or "json"
+
+        Returns:
+            Snapshot content, None if it is not archived
+        """
+        entry = self.entries.get((keyword, snapshot_date, kind))
+        return self.read(entry) if entry else None
+
+    def find(self, keyword: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+             kind: Optional[str] = None) -> List[Dict]:
+        """
+        List index entries matching a keyword and an inclusive date range.
+
+        Args:
+            keyword: Only this keyword, all if None
+            start: First date as YYYYMMDD
+            end: Last date as YYYYMMDD
+            kind: Only this kind, all if None
+
+        Returns:
+            Matching entries sorted by keyword and date
+        """
+        matches = [
+            entry for (entry_keyword, entry_date, entry_kind), entry in self.entries.items()
+            if (keyword is None or entry_keyword == keyword)
+            and (start is None or entry_date >= start)
+            and (end is None or entry_date <= end)
+            and (kind is None or entry_kind == kind)
+        ]
+        return sorted(matches, key=lambda e: (e['keyword'], e['date'], e['kind']))
+
+    def stream(self, keyword: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+               kind: Optional[str] = None) -> Iterator[Tuple[Dict, str]]:
+        """
+        Decompress matching snapshots one at a time for reparsing.
+
+        Yields:
+            Tuples of (index entry, content)
+        """
+        for entry in self.find(keyword, start, end, kind):
+            yield entry, self.read(entry)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> SnapshotArchive:
+    """Get the process-wide archive at ARCHIVE_DIR, opening it on first use"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = SnapshotArchive()
+    return _archive
+
+
+@timed('snapshot_migrate')
+def migrate_legacy_snapshots(archive: SnapshotArchive, source_dir: str = 'output',
+                             remove: bool = False) -> Dict:
+    """
+    Move output/diandian_hotwords_*.txt / *.json files into the archive.
+
+    A dictionary is trained on a sample of the files first if the archive has
+    none yet. Every file is read back from the archive and compared before it
+    is removed.
+
+    Args:
+        archive: Target archive
+        source_dir: Directory holding the legacy snapshot files
+        remove: Delete each legacy file once it is verified in the archive
+
+    Returns:
+        Dictionary with file counts, raw and stored bytes, ratios and throughput;
+        stored bytes include the dictionaries trained during the migration
+    """
+    paths = []
+    for path in sorted(glob.glob(os.path.join(glob.escape(source_dir), 'diandian_hotwords_*'))):
+        match = LEGACY_FILE_RE.match(os.path.basename(path))
+        if match:
+            paths.append((path, match))
+
+    if not paths:
+        print(f"No legacy snapshots found in {source_dir}")
+        return {'files': 0}
+
+    dictionaries_before = set(glob.glob(os.path.join(glob.escape(archive.dictionary_dir), '*.zdict')))
+    if archive.dictionary_id is None and len(paths) >= 10:
+        step = max(1, len(paths) // TRAINING_SAMPLES)
+        samples = []
+        for path, _ in paths[::step]:
+            with open(path, 'rb') as f:
+                samples.append(f.read())
+        archive.train_dictionary(samples)
+
+    objects_before = {entry['digest'] for entry in archive.entries.values()}
+    raw_bytes = 0
+    started = time.perf_counter()
+
+    for idx, (path, match) in enumerate(paths, 1):
+        with open(path, 'rb') as f:
+            data = f.read()
+        raw_bytes += len(data)
+
+        keyword, kind = match.group('keyword'), KIND_BY_EXTENSION[match.group('ext')]
+        entry = archive.put(keyword, match.group('date'), data, kind)
+
+        if remove:
+            if archive.read(entry).encode('utf-8') != data:
+                raise RuntimeError(f"Archived copy of {path} does not match, not removing it")
+            os.remove(path)
+
+        if idx % 100 == 0:
+            print(f"\rMigrating snapshots... {idx}/{len(paths)}", end='', flush=True)
+
+    write_seconds = time.perf_counter() - started
+    print()
+
+    new_digests = {entry['digest'] for entry in archive.entries.values()} - objects_before
+    object_bytes = sum(os.path.getsize(archive._object_path(digest)) for digest in new_digests)
+
+    # Dictionaries trained on these files here or by put() are part of their footprint
+    new_dictionaries = set(glob.glob(os.path.join(glob.escape(archive.dictionary_dir), '*.zdict'))) - dictionaries_before
+    dictionary_bytes = sum(os.path.getsize(path) for path in new_dictionaries)
+    stored_bytes = object_bytes + dictionary_bytes
+
+    # Read everything back to measure reparse throughput
+    started = time.perf_counter()
+    read_bytes = 0
+    for path, match in paths:
+        content = archive.get(match.group('keyword'), match.group('date'), KIND_BY_EXTENSION[match.group('ext')])
+        read_bytes += len(content.encode('utf-8'))
+    read_seconds = time.perf_counter() - started
+
+    report = {
+        'files': len(paths),
+        'unique_objects': len(new_digests),
+        'raw_bytes': raw_bytes,
+        'object_bytes': object_bytes,
+        'dictionary_bytes': dictionary_bytes,
+        'stored_bytes': stored_bytes,
+        'compression_ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+        'space_saved_bytes': raw_bytes - stored_bytes,
+        'write_mb_per_s': round(raw_bytes / 1e6 / write_seconds, 2) if write_seconds else None,
+        'read_mb_per_s': round(read_bytes / 1e6 / read_seconds, 2) if read_seconds else None,
+        'removed_legacy_files': remove
+    }
+
+    print(f"Migrated {report['files']} snapshots into {report['unique_objects']} objects")
+    print(f"Raw size: {raw_bytes / 1e6:.2f} MB, archived size: {stored_bytes / 1e6:.2f} MB including "
+          f"{dictionary_bytes / 1e6:.2f} MB of dictionaries ({report['compression_ratio']}x smaller)")
+    print(f"Write throughput: {report['write_mb_per_s']} MB/s, read throughput: {report['read_mb_per_s']} MB/s")
+    return report
@@ -1,93 +1,122 @@
-import pandas as pd
 import os
 from util.openai_util import translate_text
+from util.checkpoint_util import Checkpoint, checkpoint_path
+from util.csv_util import CsvAppender, read_column_values
+from util.metrics_util import increment
+from util.keyword_table import KeywordTable
 
 
-def generate_asa_import_file():
-	# Define constants
-	CAMPAIGN_ID = 1718142639
-	AD_GROUP_ID = 1718512513
-	MATCH_TYPE = 'BROAD'
-	INPUT_FILE = 'input/coin_us_broad.csv'
-	BID = 0.2
-	TARGET_LANGUAGE = 'PTB'
-	ACTIVE_STATUS = 'ACTIVE'
+OUTPUT_COLUMNS = ['Action', 'Keyword ID', 'Keyword', 'Match Type', 'Status', 'Bid', 'Campaign ID', 'Ad Group ID']
 
+
+# Define constants
+CAMPAIGN_ID = 1718142639
+AD_GROUP_ID = 1718512513
+MATCH_TYPE = 'BROAD'
+INPUT_FILE = 'input/coin_us_broad.csv'
+BID = 0.2
+TARGET_LANGUAGE = 'PTB'
+ACTIVE_STATUS = 'ACTIVE'
+
+
+def generate_asa_import_file(input_file=INPUT_FILE, campaign_id=CAMPAIGN_ID, ad_group_id=AD_GROUP_ID,
+							 match_type=MATCH_TYPE, bid=BID, target_language=TARGET_LANGUAGE, output_file=None):
 	# Create output directory if it doesn't exist
 	os.makedirs('output', exist_ok=True)
 
-	# Read the input CSV file
-	df = pd.read_csv(INPUT_FILE)
+	# Read the input CSV file, keeping only active keywords
+	active_keywords = KeywordTable.read_export(input_file, status=ACTIVE_STATUS)
 	
-	# Filter only active keywords
-	active_df = df[df['Status'] == ACTIVE_STATUS].copy()
-	
-	if active_df.empty:
+	if not active_keywords:
 		print("No active keywords found in input file")
 		return
-	
-	# Prepare data for output
-	output_data = []
-	seen_keywords = set()  # Track unique keywords
-	
-	# First pass: add all original keywords and count unique ones
-	keywords_to_translate = []
-	for _, row in active_df.iterrows():
-		keyword = row['Keyword'].strip().lower()  # Normalize keyword
-		if keyword not in seen_keywords:
-			seen_keywords.add(keyword)
-			output_data.append({
+
+	if not output_file:
+		output_file = f"output/{campaign_id}_{ad_group_id}_{target_language}_keyword_import.csv"
+	job_name = os.path.splitext(os.path.basename(output_file))[0]
+
+	# Journal of translated keywords; a rerun resumes from here.
+	# Both files are closed on any exit, the journal is only deleted on success
+	with Checkpoint(checkpoint_path(job_name)) as checkpoint:
+		resuming = len(checkpoint) > 0
+
+		# Rows already written by an interrupted run count as seen
+		seen_keywords = set()  # Track unique keywords
+		if resuming:
+			seen_keywords.update(kw.strip().lower() for kw in read_column_values(output_file, 'Keyword'))
+
+		def make_row(keyword):
+			return {
 				'Action': 'CREATE',
 				'Keyword ID': '',
-				'Keyword': row['Keyword'],
-				'Match Type': MATCH_TYPE,
+				'Keyword': keyword,
+				'Match Type': match_type,
 				'Status': ACTIVE_STATUS,
-				'Bid': BID,
-				'Campaign ID': CAMPAIGN_ID,
-				'Ad Group ID': AD_GROUP_ID
-			})
-			keywords_to_translate.append(row['Keyword'])
-	
-	# Second pass: translate unique keywords
-	total_to_translate = len(keywords_to_translate)
-	print(f"Found {total_to_translate} unique keywords to translate")
-	
-	for idx, keyword in enumerate(keywords_to_translate, 1):
-		translated_kw = translate_text(keyword, TARGET_LANGUAGE)
-		if translated_kw:
-			print(f"\rTranslating keywords... {idx}/{total_to_translate}", end='', flush=True)
-			translated_kw_normalized = translated_kw.strip().lower()
-			
-			if translated_kw_normalized not in seen_keywords:
-				seen_keywords.add(translated_kw_normalized)
-				output_data.append({
-					'Action': 'CREATE',
-					'Keyword ID': '',
-					'Keyword': translated_kw,
-					'Match Type': MATCH_TYPE,
-					'Status': ACTIVE_STATUS,
-					'Bid': BID,
-					'Campaign ID': CAMPAIGN_ID,
-					'Ad Group ID': AD_GROUP_ID
-				})
-		else:
-			print(f"\nWarning: Failed to translate '{keyword}' to {TARGET_LANGUAGE}")
-
-	print()  # New line after progress indicator
-	
-	# Create DataFrame from processed data
-	output_df = pd.DataFrame(output_data)
+				'Bid': bid,
+				'Campaign ID': campaign_id,
+				'Ad Group ID': ad_group_id
+			}
+
+		with CsvAppender(output_file, OUTPUT_COLUMNS, resume=resuming) as writer:
+			rows_in_output = len(seen_keywords)
+
+			try:
+				# First pass: add all original keywords and count unique ones
+				keywords_to_translate = []
+				first_pass_seen = set()
+				for keyword in active_keywords.keywords():
+					normalized = keyword.strip().lower()  # Normalize keyword
+					if normalized in first_pass_seen:
+						continue
+					first_pass_seen.add(normalized)
+					keywords_to_translate.append(keyword)
+					if normalized not in seen_keywords:
+						seen_keywords.add(normalized)
+						writer.write(make_row(keyword))
+						rows_in_output += 1
+
+				# Second pass: translate unique keywords
+				total_to_translate = len(keywords_to_translate)
+				print(f"Found {total_to_translate} unique keywords to translate")
+
+				for idx, keyword in enumerate(keywords_to_translate, 1):
+					# Journaled translations are written again if the partial output lost them
+					cached = keyword in checkpoint
+					if cached:
+						increment('cache_hits.translate_checkpoint')
+						translated_kw = checkpoint.get(keyword)
+					else:
+						translated_kw = translate_text(keyword, target_language)
+
+					if translated_kw:
+						print(f"\rTranslating keywords... {idx}/{total_to_translate}", end='', flush=True)
+						translated_kw_normalized = translated_kw.strip().lower()
+
+						if translated_kw_normalized not in seen_keywords:
+							seen_keywords.add(translated_kw_normalized)
+							writer.write(make_row(translated_kw))
+							rows_in_output += 1
+						if not cached:
+							checkpoint.record(keyword, translated_kw)
+					else:
+						# Not recorded, so a rerun retries the failed keyword
+						print(f"\nWarning: Failed to translate '{keyword}' to {target_language}")
+
+				print()  # New line after progress indicator
+
+			except KeyboardInterrupt:
+				print(f"\nInterrupted: {len(checkpoint)} keywords translated so far, partial output in {output_file}")
+				print("Run again to resume from the checkpoint")
+				raise
 
-	# Export to CSV
-	output_file = f"output/{CAMPAIGN_ID}_{AD_GROUP_ID}_{TARGET_LANGUAGE}_keyword_import.csv"
-	output_df.to_csv(output_file, index=False, na_rep='')
+		checkpoint.discard()
 
 	print(f"Successfully generated ASA import file: {output_file}")
-	print(f"Total active keywords found: {len(active_df)}")
+	print(f"Total active keywords found: {len(active_keywords)}")
 	print(f"Unique original keywords: {len(keywords_to_translate)}")
-	print(f"Total unique keywords in output (including translations): {len(output_df)}")
-	print(f"Duplicate keywords prevented: {(len(active_df) * 2) - len(output_df)}")
+	print(f"Total unique keywords in output (including translations): {rows_in_output}")
+	print(f"Duplicate keywords prevented: {(len(active_keywords) * 2) - rows_in_output}")
 
 
 if __name__ == "__main__":
-	generate_asa_import_file()
\ No newline at end of file
+	generate_asa_import_file()
@@ -0,0 +1,84 @@
+import csv
+import glob
+import json
+import os
+from util.import_validation import check_import_files, MAX_ROWS_PER_SHARD
+
+# Configuration
+INPUT_PATH = "output"
+SHARD_DIR = "output/shards"
+REPORT_FILE = "output/import_validation_report.json"
+
+
+def is_import_file(path: str) -> bool:
+    """
+    Check whether a CSV has the header of a keyword or negative keyword import file.
+
+    Args:
+        path: CSV file path
+
+    Returns:
+        True if the header has an Action column and a Keyword or Negative Keyword column
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f), [])
+    columns = {column.strip() for column in header}
+    return 'Action' in columns and bool(columns & {'Keyword', 'Negative Keyword'})
+
+
+def validate_import_files(input_path: str = INPUT_PATH, shard_dir: str = SHARD_DIR, report_file: str = REPORT_FILE,
+                          max_rows: int = MAX_ROWS_PER_SHARD, max_workers=None, shard: bool = True):
+    """
+    Check generated import files against the ASA upload limits and shard them per ad group.
+
+    Every CSV in the directory with an Action column and a Keyword or
+    Negative Keyword column is checked in a worker process. The valid rows
+    are split into files of at most max_rows rows per ad group, and every
+    problem is listed with its line number in the JSON report.
+
+    Args:
+        input_path: Import CSV file or directory of import CSV files
+        shard_dir: Directory for the upload-sized shards
+        report_file: JSON error report path
+        max_rows: Maximum rows per shard
+        max_workers: Number of worker processes, CPU count if None
+        shard: Write shards; only validate if False
+
+    Returns:
+        Report dictionary, None if no import files were found
+    """
+    if os.path.isdir(input_path):
+        paths = sorted(glob.glob(os.path.join(glob.escape(input_path), '*.csv')))
+    else:
+        paths = [input_path] if os.path.exists(input_path) else []
+
+    # Skip files that are not keyword imports, e.g. search term reports written next to them
+    import_paths = [path for path in paths if is_import_file(path)]
+
+    if not import_paths:
+        print(f"No import files found in {input_path}")
+        return None
+
+    print(f"Validating {len(import_paths)} import files...")
+    report = check_import_files(import_paths, shard_dir if shard else None, max_rows, max_workers)
+
+    for summary in report['results']:
+        counts = ', '.join(f"{rule}: {count}" for rule, count in sorted(summary['error_counts'].items()))
+        print(f"{summary['file']}: {summary['valid_rows']}/{summary['rows']} rows valid"
+              + (f" ({counts})" if counts else '')
+              + (f", {len(summary['shards'])} shards" if summary['shards'] else ''))
+
+    directory = os.path.dirname(report_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"Total: {report['valid_rows']}/{report['rows']} rows valid, {report['errors']} problems, "
+          f"{report['shards']} shards")
+    print(f"Report saved to: {report_file}")
+    return report
+
+
+if __name__ == "__main__":
+    validate_import_files()